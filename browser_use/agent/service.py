@@ -11,7 +11,6 @@ import time
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar, Union
 
-from dotenv import load_dotenv
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import (
 	BaseMessage,
@@ -58,11 +57,8 @@ from browser_use.telemetry.views import (
 )
 from browser_use.utils import check_env_variables, time_execution_async, time_execution_sync
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-SKIP_LLM_API_KEY_VERIFICATION = os.environ.get('SKIP_LLM_API_KEY_VERIFICATION', 'false').lower()[0] in 'ty1'
-
 
 def log_response(response: AgentOutput) -> None:
 	"""Utility function to log the model's response."""
@@ -1151,7 +1147,8 @@ class Agent(Generic[Context]):
 		Verify that the LLM API keys are working properly by sending a simple test prompt
 		and checking that the response contains the expected answer.
 		"""
-		if getattr(llm, '_verified_api_keys', None) is True or SKIP_LLM_API_KEY_VERIFICATION:
+		skip_verification = os.environ.get('SKIP_LLM_API_KEY_VERIFICATION', 'false').lower()[0] in 'ty1'
+		if getattr(llm, '_verified_api_keys', None) is True or skip_verification:
 			# If the LLM API keys have already been verified during a previous run, skip the test
 			return True
 
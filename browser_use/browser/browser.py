@@ -6,23 +6,27 @@ import asyncio
 import gc
 import logging
 import os
+import shutil
 import socket
 import subprocess
-from typing import Literal
-
+import tempfile
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from itertools import chain
+from typing import AsyncIterator, Literal
+
+import httpx
 import psutil
-import requests
-from dotenv import load_dotenv
 from playwright.async_api import Browser as PlaywrightBrowser
+from playwright.async_api import BrowserContext as PlaywrightBrowserContext
 from playwright.async_api import (
 	Playwright,
 	async_playwright,
 )
-from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, PrivateAttr
 from typing_extensions import TypedDict
 
-load_dotenv()
-
 from browser_use.browser.chrome import (
 	CHROME_ARGS,
 	CHROME_DETERMINISTIC_RENDERING_ARGS,
@@ -32,11 +36,17 @@ from browser_use.browser.chrome import (
 )
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
 from browser_use.browser.utils.screen_resolution import get_screen_resolution, get_window_adjustments
-from browser_use.utils import time_execution_async
+from browser_use.utils import get_registered_httpx_clients, time_execution_async
 
 logger = logging.getLogger(__name__)
 
 IN_DOCKER = os.environ.get('IN_DOCKER', 'false').lower()[0] in 'ty1'
+# opt-in: when no httpx clients were registered, close every httpx client found on the heap (slow on big processes)
+SCAN_HEAP_FOR_HTTPX_CLIENTS = os.environ.get('BROWSER_USE_SCAN_HEAP_FOR_HTTPX_CLIENTS', 'false').lower()[0] in 'ty1'
+
+CDP_VERSION_URL = 'http://127.0.0.1:9222/json/version'
+CDP_PROBE_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 2.0, 2.0, 2.0)  # exponential backoff between readiness probes
+CDP_STARTUP_TIMEOUT = 15  # total seconds to wait for a newly started chrome to expose its CDP endpoint
 
 
 class ProxySettings(TypedDict, total=False):
@@ -71,6 +81,7 @@ class BrowserConfig(BaseModel):
 		browser_binary_path: None
 			Path to a Browser instance to use to connect to your normal browser
 			e.g. '/Applications/Google\ Chrome.app/Contents/MacOS/Google\ Chrome'
+			Without a user_data_dir it is launched on a fresh temporary profile, set user_data_dir to use your profile.
 
 		keep_alive: False
 			Keep the browser alive after the agent has finished running
@@ -87,6 +98,11 @@ class BrowserConfig(BaseModel):
 			For example, "Default" or "Profile 1" for Chrome/Chromium browsers.
 			Only applicable when user_data_dir is specified.
 			Note: This option is only supported with Chromium browsers.
+
+		max_contexts: None
+			Maximum number of browser contexts that can be open at the same time on this browser.
+			Once the limit is reached, a context (also the ones created by an Agent) waits for an open one to be closed
+			before starting its session. None means unlimited.
 	"""
 
 	model_config = ConfigDict(
@@ -113,54 +129,252 @@ class BrowserConfig(BaseModel):
 	keep_alive: bool = Field(default=False, alias='_force_keep_browser_alive')  # used to be called _force_keep_browser_alive
 
 	proxy: ProxySettings | None = None
+	max_contexts: int | None = None
 	new_context_config: BrowserContextConfig = Field(default_factory=BrowserContextConfig)
 
+	# (fields the chrome args are built from, chrome args), see computed_chrome_args
+	_chrome_args_cache: tuple[tuple, tuple[str, ...]] | None = PrivateAttr(default=None)
+
+	@property
+	def computed_chrome_args(self) -> tuple[str, ...]:
+		"""The chrome args for this config (without the per-launch window args), only recomputed when the config changes"""
+		# the fields are compared on every access instead of invalidating the cache on assignment, because
+		# extra_browser_args can be changed in place and copies of the config carry the cache along
+		extra_browser_args = tuple(self.extra_browser_args)
+		fingerprint = (self.headless, self.disable_security, self.deterministic_rendering, extra_browser_args)
+		if self._chrome_args_cache is not None and self._chrome_args_cache[0] == fingerprint:
+			return self._chrome_args_cache[1]
+
+		# dict.fromkeys removes duplicates while keeping the order, some chrome flags are order-sensitive
+		chrome_args = tuple(
+			dict.fromkeys(
+				chain(
+					CHROME_ARGS,
+					CHROME_DOCKER_ARGS if IN_DOCKER else [],
+					CHROME_HEADLESS_ARGS if self.headless else [],
+					CHROME_DISABLE_SECURITY_ARGS if self.disable_security else [],
+					CHROME_DETERMINISTIC_RENDERING_ARGS if self.deterministic_rendering else [],
+					extra_browser_args,
+				)
+			)
+		)
+		self._chrome_args_cache = (fingerprint, chrome_args)
+		return chrome_args
+
+
+# process-wide playwright driver shared by all Browsers, see _acquire_playwright()
+_PLAYWRIGHT_SINGLETON: Playwright | None = None
+_PLAYWRIGHT_LOOP: asyncio.AbstractEventLoop | None = None  # the event loop the shared driver is bound to
+_PLAYWRIGHT_USERS = 0
+
+
+async def _acquire_playwright() -> Playwright:
+	"""
+	Get the playwright driver shared by all Browsers, starting it only if there is none yet.
+
+	Starting playwright spawns its node driver subprocess (~300ms), so Browsers (re)connecting to a
+	browser reuse the running one instead. Every call must be paired with _release_playwright().
+	"""
+	global _PLAYWRIGHT_SINGLETON, _PLAYWRIGHT_LOOP, _PLAYWRIGHT_USERS
+
+	loop = asyncio.get_running_loop()
+	if _PLAYWRIGHT_SINGLETON is None or _PLAYWRIGHT_LOOP is not loop:
+		playwright = await async_playwright().start()
+		if _PLAYWRIGHT_SINGLETON is None or _PLAYWRIGHT_LOOP is not loop:
+			# a driver from another (finished) event loop can't be used anymore, so it is simply replaced
+			_PLAYWRIGHT_SINGLETON, _PLAYWRIGHT_LOOP, _PLAYWRIGHT_USERS = playwright, loop, 0
+		else:
+			# another Browser started one while we were starting ours
+			await playwright.stop()
+
+	_PLAYWRIGHT_USERS += 1
+	return _PLAYWRIGHT_SINGLETON
+
+
+async def _release_playwright(playwright: Playwright) -> None:
+	"""Release a driver from _acquire_playwright(), it is only stopped once no Browser uses it anymore"""
+	global _PLAYWRIGHT_SINGLETON, _PLAYWRIGHT_LOOP, _PLAYWRIGHT_USERS
+
+	if playwright is not _PLAYWRIGHT_SINGLETON:
+		await playwright.stop()
+		return
+
+	_PLAYWRIGHT_USERS -= 1
+	if _PLAYWRIGHT_USERS > 0:
+		return
+
+	_PLAYWRIGHT_SINGLETON, _PLAYWRIGHT_LOOP, _PLAYWRIGHT_USERS = None, None, 0
+	await playwright.stop()
+
+
+async def _port_in_use(port: int) -> bool:
+	"""Check if something is listening on the given localhost port, without blocking the event loop"""
+	try:
+		_, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout=0.2)
+	except (OSError, asyncio.TimeoutError):
+		return False
+	writer.close()
+	return True
 
-# @singleton: TODO - think about id singleton makes sense here
-# @dev By default this is a singleton, but you can create multiple instances if you need to.
+
+def _terminate_process_tree(chrome_proc: psutil.Process, timeout: float = 2) -> None:
+	"""Terminate a chrome process and all of its children at once, wait for them to exit and kill any that don't"""
+	# always include all children processes, otherwise chrome leaves a bunch of zombie processes
+	procs = [*chrome_proc.children(recursive=True), chrome_proc]
+	for proc in procs:
+		try:
+			proc.terminate()
+		except psutil.NoSuchProcess:
+			pass
+
+	_, alive = psutil.wait_procs(procs, timeout=timeout)
+	for proc in alive:
+		try:
+			proc.kill()
+		except psutil.NoSuchProcess:
+			pass
+
+
+def _is_stale_singleton_lock(singleton_lock: str) -> bool:
+	"""Check if chrome's SingletonLock was left behind by a chrome on this machine that is no longer running"""
+	# the lock is a symlink to '<hostname>-<pid>' of the chrome holding the profile
+	try:
+		hostname, _, pid = os.readlink(singleton_lock).rpartition('-')
+		pid = int(pid)
+	except (OSError, ValueError):
+		return False
+	return hostname == socket.gethostname() and not psutil.pid_exists(pid)
+
+
+def _remove_file_if_exists(path: str) -> None:
+	"""Remove a file, it is fine if it doesn't exist (blocking, run it via asyncio.to_thread)"""
+	try:
+		os.remove(path)
+	except FileNotFoundError:
+		pass
+
+
+def _read_lines_if_exists(path: str) -> list[str]:
+	"""Read the lines of a file, or no lines if it doesn't exist (blocking, run it via asyncio.to_thread)"""
+	try:
+		with open(path) as f:
+			return f.read().splitlines()
+	except FileNotFoundError:
+		return []
+
+
+@dataclass
+class SharedCDPConnection:
+	"""A CDP connection shared by every Browser in the process that connects to the same cdp_url"""
+
+	playwright: Playwright  # the playwright driver the connection runs on
+	browser: PlaywrightBrowser
+	users: int = 0
+
+
+# process-wide registry of shared browsers, see Browser.get_instance()
+_BROWSER_INSTANCES: 'weakref.WeakValueDictionary[str, Browser]' = weakref.WeakValueDictionary()
+
+
+# @dev Use Browser.get_instance(config) to share one browser per config, but you can create multiple instances if you need to.
 class Browser:
 	"""
 	Playwright browser on steroids.
 
 	This is persistent browser factory that can spawn multiple browser contexts.
 	It is recommended to use only one instance of Browser per your application (RAM usage will grow otherwise).
+	Always close it, either with `await browser.close()` or by using it as `async with Browser(...) as browser:`.
 	"""
 
+	# one connection per cdp_url, shared by all Browsers of the process, see _setup_remote_cdp_browser()
+	_cdp_pool: dict[str, SharedCDPConnection] = {}
+
 	def __init__(
 		self,
 		config: BrowserConfig | None = None,
 	):
-		logger.debug('🌎  Initializing new browser')
+		# nothing is launched here, playwright + the browser are started lazily by get_playwright_browser()
 		self.config = config or BrowserConfig()
 		self.playwright: Playwright | None = None
 		self.playwright_browser: PlaywrightBrowser | None = None
 		self._persistent_context = None
+		self._refcount = 0  # number of get_instance() callers sharing this browser
+		self._instance_key: str | None = None  # key of this browser in _BROWSER_INSTANCES, if it came from get_instance()
+		self._cleanup_httpx_on_close = True  # a BrowserPool cleans up once for all its browsers instead
+		self._init_lock = asyncio.Lock()  # prevents contexts created concurrently from launching the browser twice
+		self._context_semaphore = asyncio.Semaphore(self.config.max_contexts) if self.config.max_contexts else None
+
+	@classmethod
+	def get_instance(cls, config: BrowserConfig | None = None) -> 'Browser':
+		"""
+		Get the shared Browser for this config, creating it if needed.
+
+		Every call must be paired with a close(), the browser is only torn down once the last caller closes it.
+		"""
+		config = config or BrowserConfig()
+		key = f'{cls.__module__}.{cls.__qualname__}:{config.model_dump_json(exclude={"keep_alive"})}'
+
+		browser = _BROWSER_INSTANCES.get(key)
+		if browser is None:
+			browser = cls(config=config)
+			browser._instance_key = key
+			_BROWSER_INSTANCES[key] = browser
+		browser._refcount += 1
+		return browser
+
+	async def __aenter__(self):
+		"""Async context manager entry, launches the browser"""
+		if await self.get_persistent_context() is None:
+			await self.get_playwright_browser()
+		return self
+
+	async def __aexit__(self, exc_type, exc_val, exc_tb):
+		"""Async context manager exit"""
+		await self.close()
 
 	async def new_context(self, config: BrowserContextConfig | None = None) -> BrowserContext:
-		"""Create a browser context"""
-		return BrowserContext(config=config or self.config, browser=self)
+		"""
+		Create a browser context.
+
+		All contexts share the one browser launched by get_playwright_browser(), so a new context only costs a
+		playwright new_context() call instead of a full browser launch.
+		If max_contexts is set, the context waits for one of the open contexts to be closed before its session starts.
+		"""
+		return BrowserContext(config=config or self.config.new_context_config, browser=self)
 
 	async def get_playwright_browser(self) -> PlaywrightBrowser:
 		"""Get a browser context"""
 		if self.playwright_browser is None:
-			return await self._init()
+			async with self._init_lock:
+				if self.playwright_browser is None:
+					return await self._init()
 
 		return self.playwright_browser
 
-	async def get_persistent_context(self):
-		"""Get the persistent context if using user_data_dir"""
-		if self._persistent_context is None and self.playwright is None:
-			await self._init()
+	async def get_persistent_context(self) -> PlaywrightBrowserContext | None:
+		"""
+		Get the persistent context if using user_data_dir, it is launched on first use.
+
+		This also covers browser_binary_path: the given chrome is then launched on the user_data_dir profile.
+		"""
+		if not self.config.user_data_dir or self.config.cdp_url or self.config.wss_url:
+			return None
+
+		if self._persistent_context is None:
+			async with self._init_lock:
+				if self._persistent_context is None:
+					if self.playwright is None:
+						self.playwright = await _acquire_playwright()
+					self._persistent_context = await self._setup_persistent_context(self.playwright)
 		return self._persistent_context
 
 	@time_execution_async('--init (browser)')
 	async def _init(self):
 		"""Initialize the browser session"""
-		playwright = await async_playwright().start()
-		browser = await self._setup_browser(playwright)
-
-		self.playwright = playwright
-		self.playwright_browser = browser
+		logger.debug('🌎  Initializing new browser')
+		if self.playwright is None:
+			self.playwright = await _acquire_playwright()
+		self.playwright_browser = await self._setup_browser(self.playwright)
 
 		return self.playwright_browser
 
@@ -172,11 +386,36 @@ class Browser:
 			)
 		if not self.config.cdp_url:
 			raise ValueError('CDP URL is required')
+
+		# Every new_context() on a connect_over_cdp() connection is a separate context in the same chromium. So many
+		# agents can share one connection instead of each opening its own websocket to the same browser: the first
+		# BrowserContext works in chromium's existing default context, every other one gets a context of its own.
+		# The connection lives on the playwright driver that opened it, which is the shared one from _acquire_playwright().
+		shared = self._cdp_pool.get(self.config.cdp_url)
+		if shared is not None and shared.playwright is playwright and shared.browser.is_connected():
+			logger.info(f'🔌  Reusing shared CDP connection to {self.config.cdp_url}')
+			shared.users += 1
+			return shared.browser
+
 		logger.info(f'🔌  Connecting to remote browser via CDP {self.config.cdp_url}')
 		browser_class = getattr(playwright, self.config.browser_class)
 		browser = await browser_class.connect_over_cdp(self.config.cdp_url)
+		self._cdp_pool[self.config.cdp_url] = SharedCDPConnection(playwright=playwright, browser=browser, users=1)
 		return browser
 
+	def _release_cdp_connection(self) -> bool:
+		"""Release our use of the shared CDP connection, returns True if other Browsers are still using it"""
+		shared = self._cdp_pool.get(self.config.cdp_url) if self.config.cdp_url else None
+		if shared is None or shared.browser is not self.playwright_browser:
+			return False
+
+		shared.users -= 1
+		if shared.users > 0:
+			return True
+
+		del self._cdp_pool[self.config.cdp_url]
+		return False
+
 	async def _setup_remote_wss_browser(self, playwright: Playwright) -> PlaywrightBrowser:
 		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
 		if not self.config.wss_url:
@@ -195,69 +434,46 @@ class Browser:
 			'browser_binary_path only supports chromium browsers (make sure browser_class=chromium)'
 		)
 
-		try:
+		browser_class = getattr(playwright, self.config.browser_class)
+
+		# not registered with register_httpx_client(): it closes itself, and cleanup_httpx_clients() of another Browser
+		# closing meanwhile would close it in the middle of the probe
+		async with httpx.AsyncClient(timeout=2.0) as client:
 			# Check if browser is already running
-			response = requests.get('http://localhost:9222/json/version', timeout=2)
-			if response.status_code == 200:
+			if ws_endpoint := await self._get_cdp_ws_endpoint(client):
 				logger.info('🔌  Reusing existing browser found running on http://localhost:9222')
-				browser_class = getattr(playwright, self.config.browser_class)
 				browser = await browser_class.connect_over_cdp(
-					endpoint_url='http://localhost:9222',
+					endpoint_url=ws_endpoint,
 					timeout=20000,  # 20 second timeout for connection
 				)
 				return browser
-		except requests.ConnectionError:
-			logger.debug('🌎  No existing Chrome instance found, starting a new one')
+		logger.debug('🌎  No existing Chrome instance found, starting a new one')
 
-		# Start a new Chrome instance
-		chrome_launch_cmd = [
-			self.config.browser_binary_path,
-			*{  # remove duplicates (usually preserves the order, but not guaranteed)
-				*CHROME_ARGS,
-				*(CHROME_DOCKER_ARGS if IN_DOCKER else []),
-				*(CHROME_HEADLESS_ARGS if self.config.headless else []),
-				*(CHROME_DISABLE_SECURITY_ARGS if self.config.disable_security else []),
-				*(CHROME_DETERMINISTIC_RENDERING_ARGS if self.config.deterministic_rendering else []),
-				*self.config.extra_browser_args,
-			},
-		]
-		self._chrome_subprocess = psutil.Process(
-			subprocess.Popen(
-				chrome_launch_cmd,
-				stdout=subprocess.DEVNULL,
-				stderr=subprocess.DEVNULL,
-				shell=False,
-			).pid
-		)
-
-		# Attempt to connect again after starting a new instance
-		for _ in range(10):
-			try:
-				response = requests.get('http://localhost:9222/json/version', timeout=2)
-				if response.status_code == 200:
-					break
-			except requests.ConnectionError:
-				pass
-			await asyncio.sleep(1)
-
-		# Attempt to connect again after starting a new instance
+		# Let playwright start the new Chrome instance, it talks CDP over a pipe and knows when chrome is ready.
+		# Playwright runs it on a fresh temporary profile, set user_data_dir to launch it on an existing profile instead.
+		launch_options = await self._get_builtin_launch_options()
 		try:
-			browser_class = getattr(playwright, self.config.browser_class)
-			browser = await browser_class.connect_over_cdp(
-				endpoint_url='http://localhost:9222',
-				timeout=20000,  # 20 second timeout for connection
-			)
+			browser = await browser_class.launch(executable_path=self.config.browser_binary_path, **launch_options)
 			return browser
 		except Exception as e:
 			logger.error(f'❌  Failed to start a new Chrome instance: {str(e)}')
 			raise RuntimeError(
-				'To start chrome in Debug mode, you need to close all existing Chrome instances and try again otherwise we can not connect to the instance.'
-			)
+				f'Failed to launch the chrome found at browser_binary_path {self.config.browser_binary_path}'
+			) from e
 
-	async def _setup_builtin_browser(self, playwright: Playwright) -> PlaywrightBrowser:
-		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
-		assert self.config.browser_binary_path is None, 'browser_binary_path should be None if trying to use the builtin browsers'
+	@staticmethod
+	async def _get_cdp_ws_endpoint(client: httpx.AsyncClient) -> str | None:
+		"""Get the websocket url of the chrome instance serving CDP on port 9222, if there is one"""
+		try:
+			response = await client.get(CDP_VERSION_URL)
+			if response.status_code != 200:
+				return None
+			return response.json().get('webSocketDebuggerUrl') or 'http://localhost:9222'
+		except (httpx.HTTPError, ValueError):
+			return None
 
+	async def _get_builtin_launch_options(self) -> dict:
+		"""Build the launch options shared by every browser launched locally (builtin, browser_binary_path, persistent)."""
 		if self.config.headless:
 			screen_size = {'width': 1920, 'height': 1080}
 			offset_x, offset_y = 0, 0
@@ -265,124 +481,135 @@ class Browser:
 			screen_size = get_screen_resolution()
 			offset_x, offset_y = get_window_adjustments()
 
-		chrome_args = {
-			*CHROME_ARGS,
-			*(CHROME_DOCKER_ARGS if IN_DOCKER else []),
-			*(CHROME_HEADLESS_ARGS if self.config.headless else []),
-			*(CHROME_DISABLE_SECURITY_ARGS if self.config.disable_security else []),
-			*(CHROME_DETERMINISTIC_RENDERING_ARGS if self.config.deterministic_rendering else []),
+		chrome_args = list(self.config.computed_chrome_args)
+		chrome_args += [
 			f'--window-position={offset_x},{offset_y}',
 			f'--window-size={screen_size["width"]},{screen_size["height"]}',
-			*self.config.extra_browser_args,
-		}
+		]
 
 		# check if port 9222 is already taken, if so remove the remote-debugging-port arg to prevent conflicts
-		with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-			if s.connect_ex(('localhost', 9222)) == 0:
-				chrome_args.remove('--remote-debugging-port=9222')
+		if await _port_in_use(9222):
+			chrome_args.remove('--remote-debugging-port=9222')
 
-		browser_class = getattr(playwright, self.config.browser_class)
 		args = {
-			'chromium': list(chrome_args),
-			'firefox': [
-				*{
-					'-no-remote',
-					*self.config.extra_browser_args,
-				}
-			],
-			'webkit': [
-				*{
-					'--no-startup-window',
-					*self.config.extra_browser_args,
-				}
-			],
+			'chromium': chrome_args,
+			'firefox': list(dict.fromkeys(chain(['-no-remote'], self.config.extra_browser_args))),
+			'webkit': list(dict.fromkeys(chain(['--no-startup-window'], self.config.extra_browser_args))),
 		}
 
-		# Add robust user_data_dir handling
-		if self.config.user_data_dir:
-			import os
-			
-			logger.info(f'Using user data directory: {self.config.user_data_dir}')
-			
-			# Check if profile_directory is specified but not using Chromium
-			if self.config.profile_directory and self.config.browser_class != 'chromium':
-				logger.warning(f"profile_directory '{self.config.profile_directory}' is only supported with Chromium browsers. It will be ignored.")
-			
-			# Check if user_data_dir folder exists already
-			if os.path.exists(self.config.user_data_dir):
-				# Make sure profile_directory exists inside of it already if specified
-				if self.config.profile_directory:
-					profile_path = os.path.join(self.config.user_data_dir, self.config.profile_directory)
-					if not os.path.exists(profile_path):
-						logger.warning(f"Profile directory '{self.config.profile_directory}' doesn't exist in user_data_dir. It will be created.")
-				
-				# Check for SingletonLock file which indicates Chrome is already running with this profile
-				singleton_lock = os.path.join(self.config.user_data_dir, 'SingletonLock')
-				if os.path.exists(singleton_lock):
-					try:
-						os.remove(singleton_lock)
-						logger.warning("Detected multiple Chrome processes may be sharing a single user_data_dir! "
-									  "This is not recommended and may lead to errors and failure to launch Chrome.")
-					except Exception as e:
-						logger.error(f"Failed to remove SingletonLock file: {e}")
-			else:
-				# user_data_dir does not exist yet
-				parent_dir = os.path.dirname(self.config.user_data_dir)
-				
-				# Make sure parent dir exists and is writable
-				if not os.path.exists(parent_dir):
-					logger.warning(f"Parent directory of user_data_dir doesn't exist: {parent_dir}")
-					try:
-						os.makedirs(parent_dir, exist_ok=True)
-						logger.info(f"Created parent directory: {parent_dir}")
-					except Exception as e:
-						logger.error(f"Failed to create parent directory: {e}")
-						raise RuntimeError(f"Cannot create parent directory for user_data_dir: {e}")
-				
-				# Remove --no-first-run from the chrome args as it will likely prevent creating a new user data dir
-				if '--no-first-run' in args['chromium']:
-					args['chromium'].remove('--no-first-run')
-					logger.info("Removed --no-first-run flag to allow creation of new user data directory")
-				
-			# Create user_data_dir if it doesn't exist
-			os.makedirs(self.config.user_data_dir, exist_ok=True)
-
 		# Add profile directory to args if specified for Chromium
 		if self.config.profile_directory and self.config.browser_class == 'chromium':
 			args['chromium'].append(f'--profile-directory={self.config.profile_directory}')
 			logger.debug(f'Using profile directory: {self.config.profile_directory}')
 		elif self.config.profile_directory:
-			# This should never happen as we already logged a warning, but just in case
-			logger.warning(f"profile_directory '{self.config.profile_directory}' ignored for non-Chromium browser: {self.config.browser_class}")
+			logger.warning(
+				f"profile_directory '{self.config.profile_directory}' is only supported with Chromium browsers. It will be ignored."
+			)
 
 		# Base launch options for both methods
-		common_options = {
+		launch_options = {
 			'headless': self.config.headless,
 			'args': args[self.config.browser_class],
 			'timeout': 60000,  # 60 second timeout to prevent hanging
 		}
 
 		if self.config.proxy:
-			common_options['proxy'] = self.config.proxy
+			launch_options['proxy'] = self.config.proxy
+
+		return launch_options
+
+	async def _setup_builtin_browser(self, playwright: Playwright) -> PlaywrightBrowser:
+		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
+		assert self.config.browser_binary_path is None, 'browser_binary_path should be None if trying to use the builtin browsers'
+
+		browser_class = getattr(playwright, self.config.browser_class)
+		launch_options = await self._get_builtin_launch_options()
 
 		try:
-			if self.config.user_data_dir:
-				# When using user_data_dir, we create a persistent context
-				# instead of a regular browser
-				self._persistent_context = await browser_class.launch_persistent_context(
-					user_data_dir=self.config.user_data_dir,
-					**common_options
-				)
-				
-				# Return None since context initialization will use the persistent context
-				return None
-			else:
-				# Standard browser launch
-				return await browser_class.launch(**common_options)
+			return await browser_class.launch(**launch_options)
 		except Exception as e:
 			logger.error(f'Failed to initialize browser: {str(e)}')
 			raise
 
+	async def _setup_persistent_context(self, playwright: Playwright) -> PlaywrightBrowserContext:
+		"""Sets up and returns a persistent Playwright BrowserContext backed by the configured user_data_dir."""
+		assert self.config.user_data_dir, 'user_data_dir is required to launch a persistent context'
+
+		browser_class = getattr(playwright, self.config.browser_class)
+		launch_options = await self._get_builtin_launch_options()
+		if self.config.browser_binary_path:
+			assert self.config.browser_class == 'chromium', (
+				'browser_binary_path only supports chromium browsers (make sure browser_class=chromium)'
+			)
+			launch_options['executable_path'] = self.config.browser_binary_path
+
+		# Add robust user_data_dir handling (blocking filesystem calls, so off the event loop)
+		user_data_dir = os.path.expanduser(self.config.user_data_dir)
+		created_user_data_dir = await asyncio.to_thread(self._prepare_user_data_dir, user_data_dir)
+		if created_user_data_dir and '--no-first-run' in launch_options['args']:
+			# Remove --no-first-run from the chrome args as it will likely prevent creating a new user data dir
+			launch_options['args'].remove('--no-first-run')
+			logger.info('Removed --no-first-run flag to allow creation of new user data directory')
+
+		try:
+			# When using user_data_dir, we create a persistent context instead of a regular browser
+			return await browser_class.launch_persistent_context(user_data_dir=user_data_dir, **launch_options)
+		except Exception as e:
+			logger.error(f'Failed to initialize persistent browser context: {str(e)}')
+			raise
+
+	def _prepare_user_data_dir(self, user_data_dir: str) -> bool:
+		"""Check the user_data_dir before chrome uses it and create it if needed, returns True if it was just created"""
+		logger.info(f'Using user data directory: {user_data_dir}')
+
+		# Check if user_data_dir folder exists already, listing it once is enough for all the checks below
+		try:
+			with os.scandir(user_data_dir) as entries:
+				entry_names = {entry.name for entry in entries}
+		except FileNotFoundError:
+			entry_names = None
+
+		if entry_names is not None:
+			# Make sure profile_directory exists inside of it already if specified
+			if self.config.profile_directory and self.config.profile_directory not in entry_names:
+				logger.warning(
+					f"Profile directory '{self.config.profile_directory}' doesn't exist in user_data_dir. It will be created."
+				)
+
+			# Check for SingletonLock file which indicates Chrome is already running with this profile
+			if 'SingletonLock' in entry_names:
+				singleton_lock = os.path.join(user_data_dir, 'SingletonLock')
+				if _is_stale_singleton_lock(singleton_lock):
+					# left behind by a chrome that crashed or was killed
+					try:
+						os.remove(singleton_lock)
+						logger.info('Removed the stale SingletonLock of a Chrome that is no longer running')
+					except Exception as e:
+						logger.error(f'Failed to remove SingletonLock file: {e}')
+				else:
+					# never remove the lock of a running chrome, a second chrome on the same profile corrupts it
+					logger.warning(
+						'Detected multiple Chrome processes may be sharing a single user_data_dir! '
+						'This is not recommended and may lead to errors and failure to launch Chrome.'
+					)
+			return False
+
+		# user_data_dir does not exist yet
+		parent_dir = os.path.dirname(user_data_dir)
+
+		# Make sure parent dir exists and is writable
+		if parent_dir and not os.path.exists(parent_dir):
+			logger.warning(f"Parent directory of user_data_dir doesn't exist: {parent_dir}")
+			try:
+				os.makedirs(parent_dir, exist_ok=True)
+				logger.info(f'Created parent directory: {parent_dir}')
+			except Exception as e:
+				logger.error(f'Failed to create parent directory: {e}')
+				raise RuntimeError(f'Cannot create parent directory for user_data_dir: {e}')
+
+		os.makedirs(user_data_dir, exist_ok=True)
+		return True
+
 	async def _setup_browser(self, playwright: Playwright) -> PlaywrightBrowser:
 		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
 		try:
@@ -402,74 +629,76 @@ class Browser:
 			logger.error(f'Failed to initialize Playwright browser: {e}')
 			raise
 
-	async def close(self):
-		"""Close the browser."""
+	async def close(self, collect: bool = False):
+		"""
+		Close the browser.
+
+		Args:
+			collect: also run a young-generation garbage collection (gc.collect(0)) afterwards
+		"""
+		if self._refcount > 1:
+			# still in use by other get_instance() callers, just release our reference
+			self._refcount -= 1
+			return
+		self._refcount = 0
+
+		# unregister before tearing down, so get_instance() calls in the meantime create a new Browser instead of
+		# getting this one while it is being closed
+		if self._instance_key is not None and _BROWSER_INSTANCES.get(self._instance_key) is self:
+			del _BROWSER_INSTANCES[self._instance_key]
+
 		try:
-			if not self.config.keep_alive:
-				# Close persistent context first if it exists
-				if self._persistent_context:
-					try:
-						await self._persistent_context.close()
-					except Exception as e:
-						logger.debug(f'Failed to close persistent context: {e}')
-					self._persistent_context = None
+			tasks = [asyncio.create_task(self.cleanup_httpx_clients())] if self._cleanup_httpx_on_close else []
 
-				# Then close the browser if it exists
-				if self.playwright_browser:
-					try:
-						await self.playwright_browser.close()
-					except Exception as e:
-						logger.debug(f'Failed to close playwright browser: {e}')
+			if not self.config.keep_alive:
+				if self._release_cdp_connection():
+					# other Browsers still use the shared CDP connection, leave it open
 					self.playwright_browser = None
 
-				# Then close playwright
-				if self.playwright:
-					await self.playwright.stop()
-					del self.playwright
-				
-				if chrome_proc := getattr(self, '_chrome_subprocess', None):
-					try:
-						# always kill all children processes, otherwise chrome leaves a bunch of zombie processes
-						for proc in chrome_proc.children(recursive=True):
-							proc.kill()
-						chrome_proc.kill()
-					except Exception as e:
-						logger.debug(f'Failed to terminate chrome subprocess: {e}')
+				# these don't depend on each other, so tear them down concurrently
+				tasks += [
+					asyncio.create_task(self._close_persistent_context()),
+					asyncio.create_task(self._close_playwright_browser()),
+				]
 
-			# Then cleanup httpx clients
-			await self.cleanup_httpx_clients()
+			await asyncio.gather(*tasks, return_exceptions=True)
+
+			# playwright has to be stopped last, after everything running on it is closed
+			if not self.config.keep_alive and self.playwright:
+				await _release_playwright(self.playwright)
 		except Exception as e:
 			logger.debug(f'Failed to close browser properly: {e}')
 		finally:
 			self.playwright_browser = None
 			self.playwright = None
 			self._persistent_context = None
-			self._chrome_subprocess = None
-			gc.collect()
+			if collect:
+				gc.collect(0)
 
-	def __del__(self):
-		"""Async cleanup when object is destroyed"""
-		try:
-			if self.playwright_browser or self.playwright:
-				loop = asyncio.get_running_loop()
-				if loop.is_running():
-					loop.create_task(self.close())
-				else:
-					asyncio.run(self.close())
-		except Exception as e:
-			logger.debug(f'Failed to cleanup browser in destructor: {e}')
+	async def _close_persistent_context(self):
+		"""Close the persistent context if it exists"""
+		if self._persistent_context:
+			try:
+				await self._persistent_context.close()
+			except Exception as e:
+				logger.debug(f'Failed to close persistent context: {e}')
+			self._persistent_context = None
+
+	async def _close_playwright_browser(self):
+		"""Close the playwright browser if it exists"""
+		if self.playwright_browser:
+			try:
+				await self.playwright_browser.close()
+			except Exception as e:
+				logger.debug(f'Failed to close playwright browser: {e}')
+			self.playwright_browser = None
 
 	async def cleanup_httpx_clients(self):
 		"""Cleanup all httpx clients"""
-		import gc
-
-		import httpx
-
-		# Force garbage collection to make sure all clients are in memory
-		gc.collect()
-
-		# Get all httpx clients
-		clients = [obj for obj in gc.get_objects() if isinstance(obj, httpx.AsyncClient)]
+		# Get all httpx clients created through register_httpx_client()
+		clients = get_registered_httpx_clients()
+		if not clients and SCAN_HEAP_FOR_HTTPX_CLIENTS:
+			clients = [obj for obj in gc.get_objects() if isinstance(obj, httpx.AsyncClient)]
 
 		# Close all clients
 		for client in clients:
@@ -478,3 +707,187 @@ class Browser:
 					await client.aclose()
 				except Exception as e:
 					logger.debug(f'Error closing httpx client: {e}')
+
+
+class BrowserPool:
+	"""
+	A bounded pool of Browsers for running many agents in parallel.
+
+	Browsers are created lazily up to `size` and handed back to the pool after use, so N agents share
+	at most `size` chromium processes (and their startup cost) instead of launching one each.
+
+	Usage:
+		async with BrowserPool(config, size=2) as pool:
+			async with pool.acquire() as browser:
+				agent = Agent(task=task, llm=llm, browser=browser)
+				await agent.run()
+	"""
+
+	def __init__(self, config: BrowserConfig | None = None, size: int = 2):
+		if size < 1:
+			raise ValueError('BrowserPool size must be at least 1')
+
+		config = config or BrowserConfig()
+		if config.user_data_dir and size > 1:
+			# chrome locks its profile, a second chromium on it would fail to start or break the first one
+			raise ValueError('A user_data_dir can only be used by one browser at a time, use a BrowserPool of size 1')
+
+		self.config = config
+		self.size = size
+		self._idle: asyncio.Queue[Browser | None] = asyncio.Queue(size)  # None is put on it when the pool is closed
+		self._browsers: list[Browser] = []
+		self._closed = False
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc_val, exc_tb):
+		await self.close()
+
+	@asynccontextmanager
+	async def acquire(self) -> AsyncIterator[Browser]:
+		"""Borrow a Browser from the pool, waits for one to be given back if all `size` browsers are in use"""
+		if self._closed:
+			raise RuntimeError('BrowserPool is closed')
+
+		if self._idle.empty() and len(self._browsers) < self.size:
+			browser = Browser(config=self.config)
+			browser._cleanup_httpx_on_close = False
+			self._browsers.append(browser)
+		else:
+			browser = await self._idle.get()
+			if browser is None:
+				# the pool was closed while we were waiting, pass the wake-up on to the next waiter
+				self._idle.put_nowait(None)
+				raise RuntimeError('BrowserPool is closed')
+
+		try:
+			yield browser
+		finally:
+			if self._closed:
+				# the pool was closed while the browser was borrowed, it is closed once it is given back
+				await self._close_browsers([browser])
+			else:
+				self._idle.put_nowait(browser)
+
+	async def close(self):
+		"""Close the idle browsers of the pool, browsers that are still borrowed are closed once they are given back"""
+		self._closed = True
+		idle_browsers = []
+		while not self._idle.empty():
+			browser = self._idle.get_nowait()
+			if browser is not None:
+				idle_browsers.append(browser)
+
+		# wake up the acquire() calls waiting for a browser, none will be given back to the queue anymore
+		self._idle.put_nowait(None)
+
+		await self._close_browsers(idle_browsers)
+
+	async def _close_browsers(self, browsers: list[Browser]):
+		"""Close browsers of the closed pool, the httpx clients are cleaned up once after the last one"""
+		await asyncio.gather(*(browser.close() for browser in browsers), return_exceptions=True)
+		for browser in browsers:
+			self._browsers.remove(browser)
+
+		if browsers and not self._browsers:
+			await browsers[0].cleanup_httpx_clients()
+
+
+class CDPBrowserServer:
+	"""
+	Runs a chromium that serves CDP on a free port, so many Browsers (and agents) can share it via cdp_url.
+
+	Usage:
+		async with CDPBrowserServer(BrowserConfig(browser_binary_path=...)) as server:
+			browser = Browser(config=BrowserConfig(cdp_url=server.cdp_url))
+	"""
+
+	def __init__(self, config: BrowserConfig):
+		if not config.browser_binary_path:
+			raise ValueError('A browser_binary_path is required')
+
+		self.config = config
+		self.cdp_url: str | None = None
+		self._user_data_dir = config.user_data_dir
+		self._temp_user_data_dir: str | None = None  # created by start() when no user_data_dir is configured
+		self._chrome_subprocess: psutil.Process | None = None
+
+	async def __aenter__(self):
+		await self.start()
+		return self
+
+	async def __aexit__(self, exc_type, exc_val, exc_tb):
+		await self.stop()
+
+	async def start(self) -> str:
+		"""Start chromium and return the websocket url of its CDP endpoint"""
+		if self._user_data_dir is None:
+			self._temp_user_data_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix='browser_use_cdp_')
+		user_data_dir = self._user_data_dir or self._temp_user_data_dir
+
+		# --remote-debugging-port=0 lets chrome pick a free port, it then writes it to <user_data_dir>/DevToolsActivePort
+		active_port_file = os.path.join(user_data_dir, 'DevToolsActivePort')
+		await asyncio.to_thread(_remove_file_if_exists, active_port_file)
+
+		chrome_launch_cmd = [
+			self.config.browser_binary_path,
+			*(arg for arg in self.config.computed_chrome_args if not arg.startswith('--remote-debugging-port=')),
+			'--remote-debugging-port=0',
+			f'--user-data-dir={user_data_dir}',
+		]
+		self._chrome_subprocess = psutil.Process(
+			subprocess.Popen(
+				chrome_launch_cmd,
+				stdout=subprocess.DEVNULL,
+				stderr=subprocess.DEVNULL,
+				shell=False,
+			).pid
+		)
+
+		try:
+			port, browser_path = await asyncio.wait_for(self._read_active_port(active_port_file), timeout=CDP_STARTUP_TIMEOUT)
+		except asyncio.TimeoutError:
+			await self.stop()
+			raise RuntimeError(f'Chrome did not expose its CDP endpoint within {CDP_STARTUP_TIMEOUT}s')
+		except Exception:
+			await self.stop()
+			raise
+
+		self.cdp_url = f'ws://127.0.0.1:{port}{browser_path}'
+		logger.info(f'🔌  Serving shared chrome via CDP on {self.cdp_url}')
+		return self.cdp_url
+
+	async def _read_active_port(self, active_port_file: str) -> tuple[int, str]:
+		"""Wait for chrome to write its DevToolsActivePort file (port on the first line, browser path on the second)"""
+		delays = iter(CDP_PROBE_DELAYS)
+		while True:
+			lines = await asyncio.to_thread(_read_lines_if_exists, active_port_file)
+			if len(lines) >= 2:
+				return int(lines[0]), lines[1]
+
+			if self._chrome_exited():
+				raise RuntimeError('Chrome exited before exposing its CDP endpoint')
+			await asyncio.sleep(next(delays, CDP_PROBE_DELAYS[-1]))
+
+	def _chrome_exited(self) -> bool:
+		"""Check if the chrome we started is gone already (e.g. it crashed or another chrome took over its profile)"""
+		try:
+			return self._chrome_subprocess is None or self._chrome_subprocess.status() == psutil.STATUS_ZOMBIE
+		except psutil.NoSuchProcess:
+			return True
+
+	async def stop(self):
+		"""Stop chromium, Browsers connected to it should be closed first"""
+		if chrome_proc := self._chrome_subprocess:
+			try:
+				await asyncio.to_thread(_terminate_process_tree, chrome_proc)
+			except Exception as e:
+				logger.debug(f'Failed to terminate chrome subprocess: {e}')
+		self._chrome_subprocess = None
+		self.cdp_url = None
+
+		# the temporary profile is only needed while chrome runs
+		if self._temp_user_data_dir is not None:
+			await asyncio.to_thread(shutil.rmtree, self._temp_user_data_dir, ignore_errors=True)
+			self._temp_user_data_dir = None
@@ -5,14 +5,17 @@ Playwright browser on steroids.
 import asyncio
 import base64
 import gc
+import hashlib
 import json
 import logging
 import os
 import re
 import time
 import uuid
+import weakref
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlparse
 
 from playwright._impl._errors import TimeoutError
 from playwright.async_api import Browser as PlaywrightBrowser
@@ -23,6 +26,7 @@ from playwright.async_api import (
 	ElementHandle,
 	FrameLocator,
 	Page,
+	Route,
 )
 from pydantic import BaseModel, ConfigDict, Field
 from typing_extensions import TypedDict
@@ -42,6 +46,14 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# file extensions of the resources served from BrowserContextConfig.static_cache_dir
+STATIC_RESOURCE_EXTENSIONS = {'.css', '.js', '.png', '.woff2', '.webp', '.gif'}
+# the fetched body is already decoded, so these headers of the original response don't describe the cached body
+STATIC_CACHE_SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+# playwright contexts a BrowserContext is working in, an existing context of a browser is only borrowed by one of them
+_CONTEXTS_IN_USE: 'weakref.WeakSet[PlaywrightBrowserContext]' = weakref.WeakSet()
+
 
 class BrowserContextWindowSize(TypedDict):
 	width: int
@@ -124,6 +136,13 @@ class BrowserContextConfig(BaseModel):
 
 	    timezone_id: None
 	        Changes the timezone of the browser. Example: 'Europe/Berlin'
+
+	    static_cache_dir: None
+	        Directory to cache static resources (css, js, images, fonts) in across runs. Cached files are served without
+	        hitting the network, so only use it for sites whose static resources don't change while you use the cache.
+	        Routing these requests disables chromium's own HTTP cache for the context.
+	        Only used for contexts the BrowserContext creates itself, not for a persistent context (user_data_dir)
+	        or an existing context of the browser.
 	"""
 
 	model_config = ConfigDict(
@@ -167,6 +186,7 @@ class BrowserContextConfig(BaseModel):
 	geolocation: dict | None = None
 	permissions: list[str] | None = None
 	timezone_id: str | None = None
+	static_cache_dir: str | None = None
 
 
 class BrowserSession:
@@ -230,6 +250,37 @@ class BrowserContextState:
 	target_id: str | None = None  # CDP target ID
 
 
+def _is_static_resource(url: str) -> bool:
+	"""Route matcher for the static_cache_dir, matches on the path so versioned urls (logo.png?v=1) are included"""
+	return os.path.splitext(urlparse(url).path)[1].lower() in STATIC_RESOURCE_EXTENSIONS
+
+
+def _write_file_atomically(path: str, data: bytes) -> None:
+	"""Write a file atomically, so concurrent contexts never read a partially written one"""
+	tmp_file = f'{path}.{uuid.uuid4().hex}.tmp'
+	with open(tmp_file, 'wb') as f:
+		f.write(data)
+	os.replace(tmp_file, path)
+
+
+def _write_static_cache_file(cache_file: str, body: bytes, headers: dict[str, str]) -> None:
+	"""Cache a static resource, its headers are stored last so a cache hit always finds the body too"""
+	headers = {name: value for name, value in headers.items() if name.lower() not in STATIC_CACHE_SKIPPED_HEADERS}
+	_write_file_atomically(cache_file, body)
+	_write_file_atomically(f'{cache_file}.headers.json', json.dumps(headers).encode())
+
+
+def _read_static_cache_file(cache_file: str) -> tuple[bytes, dict[str, str]] | None:
+	"""Read a cached static resource and its headers, returns None if it isn't cached"""
+	try:
+		with open(f'{cache_file}.headers.json', 'rb') as f:
+			headers = json.loads(f.read())
+		with open(cache_file, 'rb') as f:
+			return f.read(), headers
+	except FileNotFoundError:
+		return None
+
+
 class BrowserContext:
 	def __init__(
 		self,
@@ -247,6 +298,11 @@ class BrowserContext:
 		# Initialize these as None - they'll be set up when needed
 		self.session: BrowserSession | None = None
 		self.active_tab: Page | None = None
+		self._page_event_handler = None
+		self._owns_context = False  # False while working in a context we didn't create (persistent or existing one)
+
+		# held while the session is open when the browser limits the number of open contexts (max_contexts)
+		self._context_slot: asyncio.Semaphore | None = None
 
 	async def __aenter__(self):
 		"""Async context manager entry"""
@@ -283,7 +339,9 @@ class BrowserContext:
 					logger.debug(f'Failed to stop tracing: {e}')
 
 			# This is crucial - it closes the CDP connection
-			if not self.config.keep_alive:
+			# (only contexts we created, the persistent context and an existing context of the browser are shared)
+			_CONTEXTS_IN_USE.discard(self.session.context)
+			if not self.config.keep_alive and self._owns_context:
 				logger.debug('Closing browser context')
 				try:
 					await self.session.context.close()
@@ -296,6 +354,9 @@ class BrowserContext:
 			self.session = None
 			self._page_event_handler = None
 
+			# Free up our slot for the next context of the browser
+			self._release_context_slot()
+
 	def __del__(self):
 		"""Cleanup when object is destroyed"""
 		if not self.config.keep_alive and self.session is not None:
@@ -312,7 +373,26 @@ class BrowserContext:
 
 	@time_execution_async('--initialize_session')
 	async def _initialize_session(self):
-		"""Initialize the browser session"""
+		"""Initialize the browser session, waiting for a free slot first if the browser limits its open contexts"""
+		semaphore = self.browser._context_semaphore
+		if semaphore is not None and self._context_slot is None:
+			await semaphore.acquire()
+			self._context_slot = semaphore
+
+		try:
+			return await self._create_session()
+		except BaseException:
+			self._release_context_slot()
+			raise
+
+	def _release_context_slot(self):
+		"""Release the max_contexts slot of the browser, if this context holds one"""
+		if self._context_slot is not None:
+			self._context_slot.release()
+			self._context_slot = None
+
+	async def _create_session(self):
+		"""Create the browser session"""
 		logger.debug(f'🌎  Initializing new browser context with id: {self.context_id}')
 
 		# Check if the browser is using a persistent context
@@ -434,11 +514,15 @@ class BrowserContext:
 
 	async def _create_context(self, browser: PlaywrightBrowser):
 		"""Creates a new browser context with anti-detection measures and loads cookies if available."""
-		if self.browser.config.cdp_url and len(browser.contexts) > 0:
-			context = browser.contexts[0]
-		elif self.browser.config.browser_binary_path and len(browser.contexts) > 0:
+		existing_context = None
+		if (self.browser.config.cdp_url or self.browser.config.browser_binary_path) and len(browser.contexts) > 0:
+			existing_context = browser.contexts[0]
+
+		if existing_context is not None and existing_context not in _CONTEXTS_IN_USE:
 			# Connect to existing Chrome instance instead of creating new one
-			context = browser.contexts[0]
+			# (only one BrowserContext at a time works in it, e.g. when many agents share one CDP connection)
+			context = existing_context
+			self._owns_context = False
 		else:
 			# Original code for creating new context
 			context = await browser.new_context(
@@ -459,6 +543,14 @@ class BrowserContext:
 				timezone_id=self.config.timezone_id,
 			)
 
+			# only on contexts we created ourselves, contexts of an existing browser are shared with others
+			if self.config.static_cache_dir:
+				await asyncio.to_thread(os.makedirs, self.config.static_cache_dir, exist_ok=True)
+				await context.route(_is_static_resource, self._serve_static_resource)
+			self._owns_context = True
+
+		_CONTEXTS_IN_USE.add(context)
+
 		if self.config.trace_path:
 			await context.tracing.start(screenshots=True, snapshots=True, sources=True)
 
@@ -508,6 +600,39 @@ class BrowserContext:
 
 		return context
 
+	async def _serve_static_resource(self, route: Route):
+		"""Serve a static resource from the static_cache_dir, fetching and storing it there on a miss"""
+		assert self.config.static_cache_dir
+		if route.request.method != 'GET':
+			await route.continue_()
+			return
+
+		url = route.request.url
+		extension = os.path.splitext(urlparse(url).path)[1]
+		cache_file = os.path.join(self.config.static_cache_dir, hashlib.md5(url.encode()).hexdigest() + extension)
+
+		cached = await asyncio.to_thread(_read_static_cache_file, cache_file)
+		if cached is not None:
+			# replay the original headers, fonts and module scripts need their CORS headers
+			body, headers = cached
+			await route.fulfill(status=200, headers=headers, body=body)
+			return
+
+		try:
+			response = await route.fetch()
+		except Exception as e:
+			logger.debug(f'Failed to fetch static resource {url}: {e}')
+			await route.continue_()
+			return
+
+		# only full responses, a 206 partial body or an error page must not be served as the resource later on
+		if response.status == 200:
+			try:
+				await asyncio.to_thread(_write_static_cache_file, cache_file, await response.body(), response.headers)
+			except Exception as e:
+				logger.debug(f'Failed to cache static resource {url}: {e}')
+		await route.fulfill(response=response)
+
 	async def _wait_for_stable_network(self):
 		page = await self.get_current_page()
 
@@ -1,6 +1,34 @@
+import functools
 import sys
+import time
 
+SCREEN_INFO_TTL = 60  # seconds, the screen setup rarely changes during an agent run
 
+_CACHE: dict[str, tuple[object, float]] = {}  # function name -> (value, time.monotonic() when it was computed)
+
+
+def _ttl_cache(func):
+	"""Memoize a function without arguments for SCREEN_INFO_TTL seconds, so relaunching browsers doesn't query the screen again"""
+
+	@functools.wraps(func)
+	def wrapper():
+		now = time.monotonic()
+		cached = _CACHE.get(func.__name__)
+		if cached is not None and now - cached[1] < SCREEN_INFO_TTL:
+			return cached[0]
+		value = func()
+		_CACHE[func.__name__] = (value, now)
+		return value
+
+	return wrapper
+
+
+def reset_cache() -> None:
+	"""Forget the memoized screen info (e.g. in tests, or after the displays changed)"""
+	_CACHE.clear()
+
+
+@_ttl_cache
 def get_screen_resolution():
 	if sys.platform == 'darwin':  # macOS
 		try:
@@ -31,6 +59,7 @@ def get_screen_resolution():
 		return {'width': 1920, 'height': 1080}
 
 
+@_ttl_cache
 def get_window_adjustments():
 	"""Returns recommended x, y offsets for window positioning"""
 	if sys.platform == 'darwin':  # macOS
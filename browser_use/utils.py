@@ -4,9 +4,13 @@ import os
 import platform
 import signal
 import time
+import weakref
 from functools import wraps
 from sys import stderr
-from typing import Any, Callable, Coroutine, List, Optional, ParamSpec, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, List, Optional, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+	import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +21,9 @@ _exiting = False
 R = TypeVar('R')
 P = ParamSpec('P')
 
+# httpx clients created by browser-use, closed by Browser.cleanup_httpx_clients()
+_REGISTERED_CLIENTS: 'weakref.WeakSet[httpx.AsyncClient]' = weakref.WeakSet()
+
 
 class SignalHandler:
 	"""
@@ -318,3 +325,19 @@ def singleton(cls):
 def check_env_variables(keys: list[str], any_or_all=all) -> bool:
 	"""Check if all required environment variables are set"""
 	return any_or_all(os.getenv(key).strip() for key in keys)
+
+
+def register_httpx_client(client: 'httpx.AsyncClient') -> 'httpx.AsyncClient':
+	"""
+	Track an httpx client so Browser.cleanup_httpx_clients() can close it without scanning the whole heap.
+
+	Registered clients are closed by the next Browser.close() of any Browser, so only register long-lived clients
+	that should go away with the browser, not ones closed by an `async with` block.
+	"""
+	_REGISTERED_CLIENTS.add(client)
+	return client
+
+
+def get_registered_httpx_clients() -> list['httpx.AsyncClient']:
+	"""Get the httpx clients registered with register_httpx_client() that are still alive"""
+	return list(_REGISTERED_CLIENTS)
@@ -3,9 +3,11 @@ Example of how to use user_data_dir with a specific profile_directory.
 
 This example will:
 1. Launch a browser with a user_data_dir and a specific profile_directory
-2. Navigate to a website and perform actions that will be saved to that profile
-3. Close the browser
-4. Relaunch with the same profile to maintain state
+2. Open a context, navigate to a website and perform actions that will be saved to that profile
+3. Close the context, Chromium keeps running (no relaunch)
+4. Open a second context on the same browser, it works in the same profile and sees the state
+
+Both contexts share one live profile. The profile is saved to disk, so a later run starts with it again.
 
 Usage:
     python examples/browser/profile_directory_example.py
@@ -14,7 +16,6 @@ Usage:
 import asyncio
 import os
 import tempfile
-from pathlib import Path
 
 from browser_use.browser.browser import Browser, BrowserConfig
 
@@ -31,61 +32,42 @@ async def main():
     print(f"Using user data directory: {user_data_dir}")
     print(f"Using profile directory: {profile_directory}")
 
-    # First browser session - visit a site and perform an action
-    print("\n=== First browser session with Profile 1 ===")
     config = BrowserConfig(
         headless=False,
         user_data_dir=user_data_dir,
         profile_directory=profile_directory,
         browser_class="chromium"  # Must be chromium for profile_directory
     )
-    browser = Browser(config=config)
-    context = await browser.new_context()
-    
-    # Navigate to a site that will store some state
-    page = await context.get_current_page()
-    await page.goto("https://www.google.com")
-    
-    # Type something to demonstrate state persistence
-    await page.fill('input[name="q"]', "browser-use Profile 1 example")
-    
-    print("Waiting 3 seconds before closing browser...")
-    await asyncio.sleep(3)
-    
-    # Close the browser
-    await browser.close()
-    print("Browser closed. Session data should be saved to the specified profile.")
-    
-    # Wait a moment before launching again
-    print("\nWaiting 2 seconds before starting second session...\n")
-    await asyncio.sleep(2)
-    
-    # Second browser session - should maintain state from first session
-    print("=== Second browser session with Profile 1 ===")
-    print("Launching browser with the same profile...")
-    
-    config = BrowserConfig(
-        headless=False,
-        user_data_dir=user_data_dir,
-        profile_directory=profile_directory,
-        browser_class="chromium"
-    )
-    browser = Browser(config=config)
-    context = await browser.new_context()
-    
-    # Navigate to the same site - should have our search preserved
-    page = await context.get_current_page()
-    await page.goto("https://www.google.com")
-    
-    # Notice that the search input should still have our previous text
-    print("Check if the search input still contains our previous text")
-    print("Waiting 5 seconds before closing browser...")
-    await asyncio.sleep(5)
-    
-    # Close the browser
-    await browser.close()
-    print("Browser closed")
 
+    # One Chromium for both sessions, each session only opens a new context on it
+    async with Browser.get_instance(config) as browser:
+        # First session - visit a site and perform an action
+        print("\n=== First context with Profile 1 ===")
+        async with await browser.new_context() as context:
+            # Navigate to a site that will store some state
+            page = await context.get_current_page()
+            await page.goto("https://www.google.com")
+
+            # Type something to demonstrate state persistence
+            await page.fill('input[name="q"]', "browser-use Profile 1 example")
+
+            print("Waiting 3 seconds before closing the context...")
+            await asyncio.sleep(3)
+        print("Context closed. Chromium keeps running, the next context works in the same profile.")
+
+        # Second session - should maintain state from first session
+        print("\n=== Second context with Profile 1 (same Chromium, no relaunch) ===")
+        async with await browser.new_context() as context:
+            # Navigate to the same site - should have our search preserved
+            page = await context.get_current_page()
+            await page.goto("https://www.google.com")
+
+            # Notice that the search input should still have our previous text
+            print("Check if the search input still contains our previous text")
+            print("Waiting 5 seconds before closing browser...")
+            await asyncio.sleep(5)
+
+    print("Browser closed")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
@@ -5,8 +5,6 @@ from browser_use.browser.browser import Browser, BrowserConfig
 from browser_use import Agent
 from pydantic import SecretStr
 
-load_dotenv()
-
 import asyncio
 
 # Written using chatGPT, consider improving the task description
@@ -31,25 +29,23 @@ config = BrowserConfig(
     profile_directory="Default",
 )
 
-browser = Browser(config=config)
-load_dotenv()
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-	raise ValueError('GEMINI_API_KEY is not set')
-
-llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash-exp', api_key=SecretStr(api_key))
-
-agent = Agent(
-	task=task,
-	llm=llm,
-	browser=browser,
-)
-
 
 async def main():
-	await agent.run()
-	input('Press Enter to close the browser...')
-	await browser.close()
+	load_dotenv()
+	api_key = os.getenv('GEMINI_API_KEY')
+	if not api_key:
+		raise ValueError('GEMINI_API_KEY is not set')
+
+	llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash-exp', api_key=SecretStr(api_key))
+
+	async with Browser.get_instance(config) as browser:
+		agent = Agent(
+			task=task,
+			llm=llm,
+			browser=browser,
+		)
+		await agent.run()
+		input('Press Enter to close the browser...')
 
 
 if __name__ == '__main__':
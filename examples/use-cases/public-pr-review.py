@@ -5,8 +5,6 @@ from browser_use.browser.browser import Browser, BrowserConfig
 from browser_use import Agent
 from pydantic import SecretStr
 
-load_dotenv()
-
 import asyncio
 
 task = """
@@ -23,22 +21,21 @@ config = BrowserConfig(
     profile_directory="Default",
 )
 
-browser = Browser(config=config)
-load_dotenv()
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-	raise ValueError('GEMINI_API_KEY is not set')
-
-llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash-exp', api_key=SecretStr(api_key))
-
-agent = Agent(
-	task=task,
-	llm=llm,
-	browser=browser,
-)
-
 
 async def main():
+	load_dotenv()
+	api_key = os.getenv('GEMINI_API_KEY')
+	if not api_key:
+		raise ValueError('GEMINI_API_KEY is not set')
+
+	llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash-exp', api_key=SecretStr(api_key))
+
+	browser = Browser(config=config)
+	agent = Agent(
+		task=task,
+		llm=llm,
+		browser=browser,
+	)
 	await agent.run()
 	input('Press Enter to close the browser...')
 	await browser.close()
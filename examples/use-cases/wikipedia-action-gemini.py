@@ -1,47 +1,49 @@
 import os
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
-from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.browser import BrowserConfig, BrowserPool
+from browser_use.browser.context import BrowserContextConfig
 from browser_use import Agent
 from pydantic import SecretStr
 
-load_dotenv()
-
 import asyncio
 
-task = """
-Navigate to 'https://en.wikipedia.org/wiki/Internet' and scroll to the string 'The vast majority of computer'
-"""
-
+tasks = [
+    "Navigate to 'https://en.wikipedia.org/wiki/Internet' and scroll to the string 'The vast majority of computer'",
+    "Navigate to 'https://en.wikipedia.org/wiki/Internet' and find the year the term 'Internet' was first used",
+]
 
-chrome_binary_path = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
 
+# builtin chromium, every browser of the pool gets its own (a browser_binary_path or user_data_dir can't be shared)
 config = BrowserConfig(
-    browser_binary_path=chrome_binary_path,
     headless=False,
-    user_data_dir="~/Library/Application Support/Google/Chrome",
-    profile_directory="Default",
+    # the static resources of the pages barely change, reuse them across runs
+    new_context_config=BrowserContextConfig(static_cache_dir='./tmp/static_cache'),
 )
 
-browser = Browser(config=config)
-load_dotenv()
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-	raise ValueError('GEMINI_API_KEY is not set')
-
-llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash-exp', api_key=SecretStr(api_key))
 
-agent = Agent(
-	task=task,
-	llm=llm,
-	browser=browser,
-)
+async def run_task(pool: BrowserPool, llm: ChatGoogleGenerativeAI, task: str):
+	async with pool.acquire() as browser:
+		agent = Agent(
+			task=task,
+			llm=llm,
+			browser=browser,
+		)
+		await agent.run()
 
 
 async def main():
-	await agent.run()
-	input('Press Enter to close the browser...')
-	await browser.close()
+	load_dotenv()
+	api_key = os.getenv('GEMINI_API_KEY')
+	if not api_key:
+		raise ValueError('GEMINI_API_KEY is not set')
+
+	llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash-exp', api_key=SecretStr(api_key))
+
+	# 2 browsers shared by all tasks, the tasks run in parallel
+	async with BrowserPool(config, size=2) as pool:
+		await asyncio.gather(*(run_task(pool, llm, task) for task in tasks))
+		input('Press Enter to close the browser...')
 
 
 if __name__ == '__main__':
@@ -1,45 +1,46 @@
-import os
 from dotenv import load_dotenv
 from langchain_ollama import ChatOllama
-from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.browser import BrowserConfig, BrowserPool
+from browser_use.browser.context import BrowserContextConfig
 from browser_use import Agent
 
-load_dotenv()
-
 import asyncio
 
-task = """
-Navigate to 'https://en.wikipedia.org/wiki/Internet' and scroll to the string 'The vast majority of computer'
-"""
-
-chrome_binary_path = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
+tasks = [
+    "Navigate to 'https://en.wikipedia.org/wiki/Internet' and scroll to the string 'The vast majority of computer'",
+    "Navigate to 'https://en.wikipedia.org/wiki/Internet' and find the year the term 'Internet' was first used",
+]
 
+# builtin chromium, every browser of the pool gets its own (a browser_binary_path or user_data_dir can't be shared)
 config = BrowserConfig(
-    browser_binary_path=chrome_binary_path,
     headless=False,
-    user_data_dir="~/Library/Application Support/Google/Chrome",
-    profile_directory="Default",
+    # the static resources of the pages barely change, reuse them across runs
+    new_context_config=BrowserContextConfig(static_cache_dir='./tmp/static_cache'),
 )
 
-browser = Browser(config=config)
-
 # Use Ollama with DeepSeek R1 8B model
 llm = ChatOllama(
     model='qwen2.5:14b',  # Using DeepSeek Coder 1.3B as it's similar to R1 8B
     num_ctx=16000,  # Setting context window
 )
 
-agent = Agent(
-    task=task,
-    llm=llm,
-    use_vision=False,
-    browser=browser,
-)
+async def run_task(pool: BrowserPool, task: str):
+    async with pool.acquire() as browser:
+        agent = Agent(
+            task=task,
+            llm=llm,
+            use_vision=False,
+            browser=browser,
+        )
+        await agent.run()
 
 async def main():
-    await agent.run()
-    input('Press Enter to close the browser...')
-    await browser.close()
+    load_dotenv()
+
+    # 2 browsers shared by all tasks, the tasks run in parallel
+    async with BrowserPool(config, size=2) as pool:
+        await asyncio.gather(*(run_task(pool, task) for task in tasks))
+        input('Press Enter to close the browser...')
 
 if __name__ == '__main__':
     asyncio.run(main())
@@ -1,8 +1,11 @@
 import asyncio
+import os
 import subprocess
+import time
 
+import httpx
+import psutil
 import pytest
-import requests
 from playwright._impl._api_structures import ProxySettings
 
 from browser_use.browser.browser import Browser, BrowserConfig
@@ -21,7 +24,7 @@ async def test_builtin_browser_launch(monkeypatch):
 		pass
 
 	class DummyChromium:
-		async def launch(self, headless, args, proxy=None):
+		async def launch(self, headless, args, proxy=None, timeout=None):
 			return DummyBrowser()
 
 	class DummyPlaywright:
@@ -119,23 +122,26 @@ async def test_user_provided_browser_launch(monkeypatch):
 	by reusing an existing Chrome instance.
 	"""
 
-	# Dummy response for requests.get when checking chrome debugging endpoint.
+	# Dummy response for the httpx probe of the chrome debugging endpoint.
 	class DummyResponse:
 		status_code = 200
 
-	def dummy_get(url, timeout):
-		if url == 'http://localhost:9222/json/version':
+		def json(self):
+			return {'webSocketDebuggerUrl': 'ws://127.0.0.1:9222/devtools/browser/dummy'}
+
+	async def dummy_get(self, url):
+		if url == 'http://127.0.0.1:9222/json/version':
 			return DummyResponse()
-		raise requests.ConnectionError('Connection failed')
+		raise httpx.ConnectError('Connection failed')
 
-	monkeypatch.setattr(requests, 'get', dummy_get)
+	monkeypatch.setattr(httpx.AsyncClient, 'get', dummy_get)
 
 	class DummyBrowser:
 		pass
 
 	class DummyChromium:
 		async def connect_over_cdp(self, endpoint_url, timeout=20000):
-			assert endpoint_url == 'http://localhost:9222', "Endpoint URL must be 'http://localhost:9222'"
+			assert endpoint_url == 'ws://127.0.0.1:9222/devtools/browser/dummy', 'Endpoint URL must be the webSocketDebuggerUrl'
 			return DummyBrowser()
 
 	class DummyPlaywright:
@@ -164,22 +170,6 @@ async def test_builtin_browser_disable_security_args(monkeypatch):
 	This verifies that _setup_builtin_browser correctly appends the security disabling arguments along with
 	the base arguments and any extra arguments provided.
 	"""
-	# These are the base arguments defined in _setup_builtin_browser.
-	base_args = [
-		'--no-sandbox',
-		'--disable-blink-features=AutomationControlled',
-		'--disable-infobars',
-		'--disable-background-timer-throttling',
-		'--disable-popup-blocking',
-		'--disable-backgrounding-occluded-windows',
-		'--disable-renderer-backgrounding',
-		'--disable-window-activation',
-		'--disable-focus-on-load',
-		'--no-first-run',
-		'--no-default-browser-check',
-		'--no-startup-window',
-		'--window-position=0,0',
-	]
 	# When disable_security is True, these arguments should be added.
 	disable_security_args = [
 		'--disable-web-security',
@@ -188,16 +178,20 @@ async def test_builtin_browser_disable_security_args(monkeypatch):
 	]
 	# Additional arbitrary argument for testing extra args
 	extra_args = ['--dummy-extra']
+	config = BrowserConfig(headless=True, disable_security=True, extra_browser_args=extra_args)
+	# headless launches use a fixed window, the computed args come first in their (deterministic) order
+	window_args = ['--window-position=0,0', '--window-size=1920,1080']
 
 	class DummyBrowser:
 		pass
 
 	class DummyChromium:
-		async def launch(self, headless, args, proxy=None):
-			# Expected args is the base args plus disable security args and the extra args.
-			expected_args = base_args + disable_security_args + extra_args
+		async def launch(self, headless, args, proxy=None, timeout=None):
+			# Expected args are the computed chrome args (with the disable security and extra args) plus the window args.
+			expected_args = list(config.computed_chrome_args) + window_args
 			assert headless is True, 'Expected headless to be True'
 			assert args == expected_args, f'Expected args {expected_args}, but got {args}'
+			assert all(arg in args for arg in disable_security_args + extra_args)
 			assert proxy is None, 'Expected proxy to be None'
 			return DummyBrowser()
 
@@ -212,8 +206,11 @@ async def test_builtin_browser_disable_security_args(monkeypatch):
 		async def start(self):
 			return DummyPlaywright()
 
+	async def dummy_port_in_use(port):
+		return False
+
 	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
-	config = BrowserConfig(headless=True, disable_security=True, extra_browser_args=extra_args)
+	monkeypatch.setattr('browser_use.browser.browser._port_in_use', dummy_port_in_use)
 	browser_obj = Browser(config=config)
 	result_browser = await browser_obj.get_playwright_browser()
 	assert isinstance(result_browser, DummyBrowser), (
@@ -238,32 +235,77 @@ async def test_new_context_creation():
 	await browser_obj.close()
 
 
+@pytest.mark.asyncio
+async def test_user_provided_browser_starts_new_chrome(monkeypatch):
+	"""
+	Test that when no Chrome instance is running on port 9222, the Browser._setup_user_provided_browser branch
+	lets playwright launch the given browser binary instead of starting and polling it by hand.
+	"""
+
+	async def dummy_get(self, url):
+		raise httpx.ConnectError('Simulated connection failure')
+
+	monkeypatch.setattr(httpx.AsyncClient, 'get', dummy_get)
+
+	class DummyBrowser:
+		pass
+
+	launches = []
+
+	class DummyChromium:
+		async def launch(self, executable_path, headless, args, timeout=None, proxy=None):
+			launches.append((executable_path, headless, args, timeout, proxy))
+			return DummyBrowser()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+
+		async def stop(self):
+			pass
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			return DummyPlaywright()
+
+	async def dummy_port_in_use(port):
+		return False
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	monkeypatch.setattr('browser_use.browser.browser._port_in_use', dummy_port_in_use)
+	proxy = {'server': 'http://proxy.example:8080'}
+	config = BrowserConfig(browser_binary_path='dummy/chrome', headless=True, extra_browser_args=['--dummy-arg'], proxy=proxy)
+	browser_obj = Browser(config=config)
+	result_browser = await browser_obj.get_playwright_browser()
+	assert isinstance(result_browser, DummyBrowser)
+	assert len(launches) == 1
+	executable_path, headless, args, timeout, launch_proxy = launches[0]
+	assert executable_path == 'dummy/chrome'
+	assert headless is True
+	assert args[: len(config.computed_chrome_args)] == list(config.computed_chrome_args)
+	assert timeout == 60000, 'Expected the same launch timeout as the builtin browser'
+	assert launch_proxy == proxy, 'Expected the proxy to be passed to the launched chrome'
+	await browser_obj.close()
+
+
 @pytest.mark.asyncio
 async def test_user_provided_browser_launch_failure(monkeypatch):
 	"""
 	Test that when a Chrome instance cannot be started or connected to,
-	the Browser._setup_user_provided_browser branch eventually raises a RuntimeError.
+	the Browser._setup_user_provided_browser branch raises a RuntimeError.
 	We simulate failure by:
-	  - Forcing requests.get to always raise a ConnectionError (so no existing instance is found).
-	  - Monkeypatching subprocess.Popen to do nothing.
-	  - Replacing asyncio.sleep to avoid delays.
-	  - Having the dummy playwright's connect_over_cdp method always raise an Exception.
+	  - Forcing the httpx probe to always raise a ConnectError (so no existing instance is found).
+	  - Having the dummy playwright's launch method always raise an Exception.
 	"""
 
-	def dummy_get(url, timeout):
-		raise requests.ConnectionError('Simulated connection failure')
-
-	monkeypatch.setattr(requests, 'get', dummy_get)
-	monkeypatch.setattr(subprocess, 'Popen', lambda args, stdout, stderr: None)
+	async def dummy_get(self, url):
+		raise httpx.ConnectError('Simulated connection failure')
 
-	async def fake_sleep(seconds):
-		return
-
-	monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+	monkeypatch.setattr(httpx.AsyncClient, 'get', dummy_get)
 
 	class DummyChromium:
-		async def connect_over_cdp(self, endpoint_url, timeout=20000):
-			raise Exception('Connection failed simulation')
+		async def launch(self, executable_path, headless, args, timeout=None, proxy=None):
+			raise Exception('Launch failed simulation')
 
 	class DummyPlaywright:
 		def __init__(self):
@@ -279,8 +321,9 @@ async def test_user_provided_browser_launch_failure(monkeypatch):
 	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
 	config = BrowserConfig(browser_binary_path='dummy/chrome', extra_browser_args=['--dummy-arg'])
 	browser_obj = Browser(config=config)
-	with pytest.raises(RuntimeError, match='To start chrome in Debug mode'):
+	with pytest.raises(RuntimeError, match='Failed to launch the chrome found at browser_binary_path dummy/chrome') as exc_info:
 		await browser_obj.get_playwright_browser()
+	assert str(exc_info.value.__cause__) == 'Launch failed simulation', 'Expected the launch error to be kept as the cause'
 	await browser_obj.close()
 
 
@@ -296,7 +339,7 @@ async def test_get_playwright_browser_caching(monkeypatch):
 		pass
 
 	class DummyChromium:
-		async def launch(self, headless, args, proxy=None):
+		async def launch(self, headless, args, proxy=None, timeout=None):
 			return DummyBrowser()
 
 	class DummyPlaywright:
@@ -359,7 +402,7 @@ async def test_standard_browser_launch_with_proxy(monkeypatch):
 	dummy_proxy = ProxySettings(server='http://dummy.proxy')
 
 	class DummyChromium:
-		async def launch(self, headless, args, proxy=None):
+		async def launch(self, headless, args, proxy=None, timeout=None):
 			# Assert that the proxy passed equals the dummy proxy provided in the configuration.
 			assert proxy == dummy_proxy, f'Expected proxy {dummy_proxy} but got {proxy}'
 			# We can also verify some base parameters if needed (headless, args) but our focus is proxy.
@@ -385,3 +428,761 @@ async def test_standard_browser_launch_with_proxy(monkeypatch):
 	result_browser = await browser_obj.get_playwright_browser()
 	assert isinstance(result_browser, DummyBrowser), 'Expected DummyBrowser from _setup_builtin_browser with proxy provided'
 	await browser_obj.close()
+
+
+@pytest.mark.asyncio
+async def test_get_instance_shares_browser_per_config():
+	"""
+	Test that Browser.get_instance returns the same Browser for equal configs (ignoring keep_alive)
+	and a different Browser for a different config.
+	"""
+	first = Browser.get_instance(BrowserConfig(headless=True, extra_browser_args=['--shared']))
+	second = Browser.get_instance(BrowserConfig(headless=True, extra_browser_args=['--shared'], keep_alive=True))
+	other = Browser.get_instance(BrowserConfig(headless=False, extra_browser_args=['--shared']))
+	assert first is second, 'Expected equal configs to share one Browser'
+	assert first is not other, 'Expected different configs to get different Browsers'
+	await first.close()
+	await second.close()
+	await other.close()
+
+
+@pytest.mark.asyncio
+async def test_get_instance_close_is_refcounted():
+	"""
+	Test that a shared Browser is only torn down once every get_instance() caller has closed it.
+	"""
+
+	class DummyBrowser:
+		closed = False
+
+		async def close(self):
+			self.closed = True
+
+	config = BrowserConfig(headless=True, extra_browser_args=['--refcounted'])
+	first = Browser.get_instance(config)
+	second = Browser.get_instance(config)
+	dummy_browser = DummyBrowser()
+	first.playwright_browser = dummy_browser
+
+	await first.close()
+	assert not dummy_browser.closed, 'Expected the browser to stay open while another caller still uses it'
+	assert second.playwright_browser is dummy_browser
+
+	await second.close()
+	assert dummy_browser.closed, 'Expected the browser to be closed once the last caller closed it'
+	assert second.playwright_browser is None
+
+
+@pytest.mark.asyncio
+async def test_get_instance_while_closing_creates_new_browser():
+	"""
+	Test that get_instance() called while the shared Browser is being torn down returns a new Browser
+	instead of the one that is being closed.
+	"""
+	close_started = asyncio.Event()
+	finish_close = asyncio.Event()
+
+	class DummyBrowser:
+		async def close(self):
+			close_started.set()
+			await finish_close.wait()
+
+	config = BrowserConfig(headless=True, extra_browser_args=['--closing'])
+	closing = Browser.get_instance(config)
+	dummy_browser = DummyBrowser()
+	closing.playwright_browser = dummy_browser
+
+	close_task = asyncio.create_task(closing.close())
+	await close_started.wait()
+	reopened = Browser.get_instance(config)
+	assert reopened is not closing, 'Expected a new Browser while the shared one is being closed'
+
+	finish_close.set()
+	await close_task
+	assert reopened._refcount == 1
+	assert Browser.get_instance(config) is reopened, 'Expected the new Browser to be the shared one'
+	await reopened.close()
+	await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_contexts_respect_max_contexts():
+	"""
+	Test that with max_contexts set, a context waits for an open context to be closed before starting its session,
+	also when it is created directly (like Agent does) instead of through Browser.new_context().
+	"""
+
+	class DummyPage:
+		url = 'about:blank'
+
+		async def bring_to_front(self):
+			pass
+
+		async def wait_for_load_state(self, state=None):
+			pass
+
+	class DummyPersistentContext:
+		pages = [DummyPage()]
+
+		def on(self, event, handler):
+			pass
+
+		async def close(self):
+			pass
+
+	browser_obj = Browser(config=BrowserConfig(max_contexts=1))
+
+	async def dummy_get_persistent_context():
+		return DummyPersistentContext()
+
+	browser_obj.get_persistent_context = dummy_get_persistent_context
+
+	first_context = await browser_obj.new_context()
+	assert first_context.config == browser_obj.config.new_context_config
+	await first_context.get_session()
+
+	second_context = BrowserContext(browser=browser_obj, config=BrowserContextConfig())
+	second_session_task = asyncio.create_task(second_context.get_session())
+	await asyncio.sleep(0)
+	assert not second_session_task.done(), 'Expected the second context to wait while max_contexts contexts are open'
+
+	await first_context.close()
+	await asyncio.wait_for(second_session_task, timeout=1)
+	await second_context.close()
+	assert browser_obj._context_semaphore._value == 1, 'Expected every slot to be released again'
+	await browser_obj.close()
+
+
+@pytest.mark.asyncio
+async def test_persistent_context_launched_once(monkeypatch, tmp_path):
+	"""
+	Test that with a user_data_dir the persistent context is launched lazily on first use
+	and then shared by every later caller instead of relaunching the browser.
+	"""
+	launches = []
+
+	class DummyPersistentContext:
+		async def close(self):
+			pass
+
+	class DummyChromium:
+		async def launch_persistent_context(self, user_data_dir, headless, args, timeout=None, proxy=None):
+			launches.append(user_data_dir)
+			return DummyPersistentContext()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+
+		async def stop(self):
+			pass
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			return DummyPlaywright()
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	config = BrowserConfig(headless=True, user_data_dir=str(tmp_path / 'profile'))
+	browser_obj = Browser(config=config)
+	assert launches == [], 'Expected nothing to be launched before first use'
+
+	first = await browser_obj.get_persistent_context()
+	second = await browser_obj.get_persistent_context()
+	assert isinstance(first, DummyPersistentContext)
+	assert first is second, 'Expected the persistent context to be reused'
+	assert launches == [config.user_data_dir]
+	await browser_obj.close()
+
+
+@pytest.mark.asyncio
+async def test_user_provided_browser_with_user_data_dir_uses_persistent_context(monkeypatch, tmp_path):
+	"""
+	Test that a browser_binary_path together with a user_data_dir launches the given chrome on that profile
+	as a persistent context, so its saved cookies and logins are available.
+	"""
+	launches = []
+
+	class DummyPersistentContext:
+		async def close(self):
+			pass
+
+	class DummyChromium:
+		async def launch_persistent_context(self, user_data_dir, executable_path, headless, args, timeout=None, proxy=None):
+			launches.append((user_data_dir, executable_path))
+			return DummyPersistentContext()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+
+		async def stop(self):
+			pass
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			return DummyPlaywright()
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	config = BrowserConfig(headless=True, browser_binary_path='dummy/chrome', user_data_dir=str(tmp_path / 'profile'))
+	browser_obj = Browser(config=config)
+
+	persistent_context = await browser_obj.get_persistent_context()
+	assert isinstance(persistent_context, DummyPersistentContext)
+	assert launches == [(config.user_data_dir, 'dummy/chrome')]
+	await browser_obj.close()
+
+
+def test_computed_chrome_args_cached_until_config_changes():
+	"""
+	Test that BrowserConfig.computed_chrome_args is computed once, and recomputed after a field is reassigned,
+	extra_browser_args is changed in place or a copy of the config is updated.
+	"""
+	config = BrowserConfig(headless=False, extra_browser_args=['--dummy-extra'])
+	chrome_args = config.computed_chrome_args
+	assert '--dummy-extra' in chrome_args
+	assert '--headless=new' not in chrome_args
+	assert config.computed_chrome_args is chrome_args, 'Expected the chrome args to be cached'
+
+	config.headless = True
+	assert '--headless=new' in config.computed_chrome_args, 'Expected the chrome args to be recomputed after assignment'
+
+	config.extra_browser_args.append('--dummy-appended')
+	assert '--dummy-appended' in config.computed_chrome_args, 'Expected the chrome args to be recomputed after an in-place change'
+
+	copied = config.model_copy(update={'headless': False})
+	assert '--headless=new' not in copied.computed_chrome_args, 'Expected a copy not to keep stale chrome args'
+	assert 'chrome_args_cache' not in config.model_dump_json(), 'Expected the cache not to be part of the config'
+
+
+@pytest.mark.asyncio
+async def test_get_instance_follows_config_changes():
+	"""
+	Test that Browser.get_instance looks the config up by its current values, also after in-place changes of nested values.
+	"""
+	config = BrowserConfig(headless=True)
+	first = Browser.get_instance(config)
+	assert Browser.get_instance(config) is first
+
+	config.new_context_config.locale = 'de-DE'
+	changed = Browser.get_instance(config)
+	assert changed is not first, 'Expected an in-place change of a nested value to select another Browser'
+
+	await changed.close()
+	await first.close()
+	await first.close()
+
+
+def test_computed_chrome_args_deduplicated_in_order():
+	"""
+	Test that BrowserConfig.computed_chrome_args removes duplicate flags while keeping their order stable.
+	"""
+	from browser_use.browser.chrome import CHROME_ARGS
+
+	config = BrowserConfig(extra_browser_args=['--dummy-b', CHROME_ARGS[0], '--dummy-a', '--dummy-b'])
+	chrome_args = config.computed_chrome_args
+	assert len(chrome_args) == len(set(chrome_args)), 'Expected duplicate flags to be removed'
+	default_args = list(dict.fromkeys(CHROME_ARGS))
+	assert list(chrome_args[: len(default_args)]) == default_args, 'Expected the default flags to come first'
+	assert chrome_args[-2:] == ('--dummy-b', '--dummy-a'), 'Expected the extra flags to keep their order'
+
+
+@pytest.mark.asyncio
+async def test_cdp_connection_shared_between_browsers(monkeypatch):
+	"""
+	Test that Browsers using the same cdp_url share one CDP connection,
+	which is only closed once the last of them is closed.
+	"""
+	connections = []
+
+	class DummyBrowser:
+		closed = False
+
+		def is_connected(self):
+			return not self.closed
+
+		async def close(self):
+			self.closed = True
+
+	class DummyChromium:
+		async def connect_over_cdp(self, endpoint_url, timeout=20000):
+			connections.append(endpoint_url)
+			return DummyBrowser()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+			self.stopped = False
+
+		async def stop(self):
+			self.stopped = True
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			return DummyPlaywright()
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	first = Browser(config=BrowserConfig(cdp_url='ws://dummy-shared-cdp-url'))
+	second = Browser(config=BrowserConfig(cdp_url='ws://dummy-shared-cdp-url'))
+	first_browser = await first.get_playwright_browser()
+	second_browser = await second.get_playwright_browser()
+	assert first_browser is second_browser, 'Expected both Browsers to share the CDP connection'
+	assert connections == ['ws://dummy-shared-cdp-url']
+
+	await first.close()
+	assert not first_browser.closed, 'Expected the shared connection to stay open while still in use'
+
+	await second.close()
+	assert first_browser.closed, 'Expected the shared connection to be closed by its last user'
+
+
+@pytest.mark.asyncio
+async def test_contexts_on_shared_cdp_connection_get_their_own_context(monkeypatch):
+	"""
+	Test that BrowserContexts of Browsers sharing one CDP connection don't work in the same playwright context:
+	the first one borrows chrome's existing default context, the second gets a new one,
+	and closing them never closes the borrowed default context.
+	"""
+	from browser_use.browser.context import BrowserSession
+
+	class DummyContext:
+		def __init__(self):
+			self.pages = []
+			self.closed = False
+
+		def on(self, event, handler):
+			pass
+
+		async def add_init_script(self, script):
+			pass
+
+		async def close(self):
+			self.closed = True
+
+	default_context = DummyContext()
+
+	class DummyBrowser:
+		def __init__(self):
+			self.contexts = [default_context]
+
+		def is_connected(self):
+			return True
+
+		async def new_context(self, **kwargs):
+			context = DummyContext()
+			self.contexts.append(context)
+			return context
+
+		async def close(self):
+			pass
+
+	class DummyChromium:
+		async def connect_over_cdp(self, endpoint_url, timeout=20000):
+			return DummyBrowser()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+
+		async def stop(self):
+			pass
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			return DummyPlaywright()
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	first = Browser(config=BrowserConfig(cdp_url='ws://dummy-shared-cdp-url'))
+	second = Browser(config=BrowserConfig(cdp_url='ws://dummy-shared-cdp-url'))
+	first_context = BrowserContext(browser=first, config=BrowserContextConfig())
+	second_context = BrowserContext(browser=second, config=BrowserContextConfig())
+
+	first_playwright_context = await first_context._create_context(await first.get_playwright_browser())
+	second_playwright_context = await second_context._create_context(await second.get_playwright_browser())
+	assert first_playwright_context is default_context, 'Expected the first context to borrow the default context'
+	assert second_playwright_context is not default_context, 'Expected the second context to get a context of its own'
+
+	first_context.session = BrowserSession(context=first_playwright_context)
+	second_context.session = BrowserSession(context=second_playwright_context)
+	await first_context.close()
+	await second_context.close()
+	assert not default_context.closed, 'Expected the borrowed default context to be left open'
+	assert second_playwright_context.closed, 'Expected the own context to be closed'
+
+	# once released, the default context can be borrowed again
+	third_context = BrowserContext(browser=first, config=BrowserContextConfig())
+	assert await third_context._create_context(await first.get_playwright_browser()) is default_context
+	await first.close()
+	await second.close()
+
+
+@pytest.mark.asyncio
+async def test_cdp_browser_server_fails_fast_when_chrome_exits(monkeypatch, tmp_path):
+	"""
+	Test that CDPBrowserServer.start() stops waiting as soon as chrome exits without exposing its CDP endpoint,
+	and removes the temporary profile it created.
+	"""
+	import tempfile
+
+	from browser_use.browser.browser import CDPBrowserServer
+
+	monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+	server = CDPBrowserServer(BrowserConfig(browser_binary_path='/bin/true'))
+	started = time.monotonic()
+	with pytest.raises(RuntimeError, match='exited before exposing'):
+		await server.start()
+	assert time.monotonic() - started < 5, 'Expected start() not to wait for the full startup timeout'
+	assert list(tmp_path.iterdir()) == [], 'Expected the temporary profile to be removed'
+	assert server.cdp_url is None
+
+
+@pytest.mark.asyncio
+async def test_cleanup_httpx_clients_closes_registered_clients():
+	"""
+	Test that cleanup_httpx_clients closes the httpx clients registered with register_httpx_client
+	and leaves unregistered clients alone.
+	"""
+	from browser_use.utils import register_httpx_client
+
+	registered_client = register_httpx_client(httpx.AsyncClient())
+	unregistered_client = httpx.AsyncClient()
+
+	browser_obj = Browser(config=BrowserConfig())
+	await browser_obj.cleanup_httpx_clients()
+	assert registered_client.is_closed, 'Expected the registered client to be closed'
+	assert not unregistered_client.is_closed, 'Expected unregistered clients to be left alone'
+	await unregistered_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cdp_probe_survives_other_browser_closing(monkeypatch):
+	"""
+	Test that another Browser closing (and cleaning up httpx clients) while a Browser probes for a running chrome
+	does not close the probe's httpx client.
+	"""
+
+	class DummyResponse:
+		status_code = 200
+
+		def json(self):
+			return {'webSocketDebuggerUrl': 'ws://127.0.0.1:9222/devtools/browser/dummy'}
+
+	async def dummy_get(self, url):
+		await Browser(config=BrowserConfig()).cleanup_httpx_clients()
+		assert not self.is_closed, 'Expected the probe client not to be closed by another Browser'
+		return DummyResponse()
+
+	monkeypatch.setattr(httpx.AsyncClient, 'get', dummy_get)
+
+	class DummyBrowser:
+		pass
+
+	class DummyChromium:
+		async def connect_over_cdp(self, endpoint_url, timeout=20000):
+			return DummyBrowser()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+
+		async def stop(self):
+			pass
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			return DummyPlaywright()
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	browser_obj = Browser(config=BrowserConfig(browser_binary_path='dummy/chrome'))
+	assert isinstance(await browser_obj.get_playwright_browser(), DummyBrowser)
+	await browser_obj.close()
+
+
+@pytest.mark.asyncio
+async def test_browser_async_context_manager(monkeypatch):
+	"""
+	Test that using Browser as an async context manager launches the browser on entry and closes it on exit.
+	"""
+
+	class DummyBrowser:
+		closed = False
+
+		async def close(self):
+			self.closed = True
+
+	class DummyChromium:
+		async def launch(self, headless, args, proxy=None, timeout=None):
+			return DummyBrowser()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+
+		async def stop(self):
+			pass
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			return DummyPlaywright()
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	async with Browser(config=BrowserConfig(headless=True)) as browser_obj:
+		dummy_browser = browser_obj.playwright_browser
+		assert isinstance(dummy_browser, DummyBrowser), 'Expected the browser to be launched on entry'
+	assert dummy_browser.closed, 'Expected the browser to be closed on exit'
+	assert browser_obj.playwright_browser is None
+
+
+@pytest.mark.asyncio
+async def test_port_in_use():
+	"""
+	Test that _port_in_use detects a listening localhost port and reports a closed one as free.
+	"""
+	from browser_use.browser.browser import _port_in_use
+
+	server = await asyncio.start_server(lambda reader, writer: writer.close(), '127.0.0.1', 0)
+	port = server.sockets[0].getsockname()[1]
+	assert await _port_in_use(port), 'Expected a listening port to be reported as in use'
+	server.close()
+	await server.wait_closed()
+	assert not await _port_in_use(port), 'Expected a closed port to be reported as free'
+
+
+def test_terminate_process_tree():
+	"""
+	Test that _terminate_process_tree terminates a process together with its children and reaps them.
+	"""
+	from browser_use.browser.browser import _terminate_process_tree
+
+	parent = subprocess.Popen(['sh', '-c', 'sleep 30 & sleep 30 & wait'])
+	chrome_proc = psutil.Process(parent.pid)
+	for _ in range(50):
+		if len(chrome_proc.children(recursive=True)) == 2:
+			break
+		time.sleep(0.05)
+	children = chrome_proc.children(recursive=True)
+
+	_terminate_process_tree(chrome_proc, timeout=2)
+	assert parent.poll() is not None, 'Expected the parent process to have exited'
+	assert not any(child.is_running() and child.status() != psutil.STATUS_ZOMBIE for child in children), (
+		'Expected all child processes to have exited'
+	)
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_bounds_and_reuses_browsers():
+	"""
+	Test that BrowserPool creates at most `size` Browsers, makes extra callers wait
+	and hands the same Browsers out again once they are given back.
+	"""
+	from browser_use.browser.browser import BrowserPool
+
+	async with BrowserPool(BrowserConfig(headless=True), size=2) as pool:
+		async with pool.acquire() as first, pool.acquire() as second:
+			assert first is not second, 'Expected two different Browsers while both are in use'
+
+			third_acquired = asyncio.Event()
+
+			async def acquire_third():
+				async with pool.acquire() as third:
+					third_acquired.set()
+					return third
+
+			third_task = asyncio.create_task(acquire_third())
+			await asyncio.sleep(0)
+			assert not third_acquired.is_set(), 'Expected the third caller to wait for a free Browser'
+
+		third = await asyncio.wait_for(third_task, timeout=1)
+		assert third in (first, second), 'Expected a given back Browser to be reused'
+		assert len(pool._browsers) == 2
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_close_waits_for_borrowed_browsers():
+	"""
+	Test that BrowserPool.close() only closes idle Browsers right away, a borrowed Browser is closed once it is given back.
+	The httpx clients are cleaned up once, after the last Browser is closed.
+	"""
+	from browser_use.browser.browser import BrowserPool
+
+	closed = []
+	cleanups = []
+	pool = BrowserPool(BrowserConfig(headless=True), size=2)
+	borrowing = pool.acquire()
+	borrowed = await borrowing.__aenter__()
+	async with pool.acquire() as idle:
+		pass
+
+	for browser in (idle, borrowed):
+
+		async def dummy_close(browser=browser):
+			closed.append(browser)
+
+		async def dummy_cleanup_httpx_clients():
+			cleanups.append(closed[:])
+
+		browser.close = dummy_close
+		browser.cleanup_httpx_clients = dummy_cleanup_httpx_clients
+
+	await pool.close()
+	assert closed == [idle], 'Expected only the idle Browser to be closed while the other one is borrowed'
+	assert cleanups == [], 'Expected the httpx clients to be cleaned up only after the last Browser is closed'
+
+	await borrowing.__aexit__(None, None, None)
+
+	assert closed == [idle, borrowed], 'Expected the borrowed Browser to be closed once given back'
+	assert cleanups == [[idle, borrowed]], 'Expected the httpx clients to be cleaned up once for the whole pool'
+	assert pool._browsers == []
+	with pytest.raises(RuntimeError, match='closed'):
+		async with pool.acquire():
+			pass
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_close_wakes_waiting_acquires():
+	"""
+	Test that acquire() calls waiting for a Browser raise once the pool is closed instead of waiting forever.
+	"""
+	from browser_use.browser.browser import BrowserPool
+
+	pool = BrowserPool(BrowserConfig(headless=True), size=1)
+
+	async def acquire():
+		async with pool.acquire():
+			pass
+
+	async with pool.acquire() as borrowed:
+
+		async def dummy_close():
+			pass
+
+		borrowed.close = dummy_close
+
+		waiters = [asyncio.create_task(acquire()) for _ in range(2)]
+		await asyncio.sleep(0)
+		assert not any(waiter.done() for waiter in waiters), 'Expected the acquires to wait for the borrowed Browser'
+
+		await pool.close()
+		for waiter in waiters:
+			with pytest.raises(RuntimeError, match='BrowserPool is closed'):
+				await asyncio.wait_for(waiter, timeout=1)
+
+
+def test_browser_pool_rejects_shared_user_data_dir(tmp_path):
+	"""
+	Test that a BrowserPool of more than one browser can't share a user_data_dir, chrome locks its profile.
+	"""
+	from browser_use.browser.browser import BrowserPool
+
+	with pytest.raises(ValueError, match='user_data_dir'):
+		BrowserPool(BrowserConfig(user_data_dir=str(tmp_path)), size=2)
+	BrowserPool(BrowserConfig(user_data_dir=str(tmp_path)), size=1)
+
+
+@pytest.mark.asyncio
+async def test_playwright_driver_shared_between_browsers(monkeypatch):
+	"""
+	Test that Browsers share one playwright driver, which is only stopped once the last Browser using it is closed.
+	"""
+	started = []
+
+	class DummyBrowser:
+		async def close(self):
+			pass
+
+	class DummyChromium:
+		async def launch(self, headless, args, proxy=None, timeout=None):
+			return DummyBrowser()
+
+	class DummyPlaywright:
+		def __init__(self):
+			self.chromium = DummyChromium()
+			self.stopped = False
+
+		async def stop(self):
+			self.stopped = True
+
+	class DummyAsyncPlaywrightContext:
+		async def start(self):
+			started.append(DummyPlaywright())
+			return started[-1]
+
+	monkeypatch.setattr('browser_use.browser.browser.async_playwright', lambda: DummyAsyncPlaywrightContext())
+	first = Browser(config=BrowserConfig(headless=True))
+	second = Browser(config=BrowserConfig(headless=True))
+	await first.get_playwright_browser()
+	await second.get_playwright_browser()
+	assert len(started) == 1, 'Expected the playwright driver to be started only once'
+	assert first.playwright is second.playwright
+
+	await first.close()
+	assert not started[0].stopped, 'Expected the driver to keep running while still in use'
+	await second.close()
+	assert started[0].stopped, 'Expected the driver to be stopped by its last user'
+
+
+def test_prepare_user_data_dir(tmp_path):
+	"""
+	Test that _prepare_user_data_dir creates a missing user_data_dir (reporting it as new),
+	and only removes a SingletonLock of an existing one when the chrome holding it is no longer running.
+	"""
+	import socket
+
+	user_data_dir = tmp_path / 'parent' / 'profile'
+	browser_obj = Browser(config=BrowserConfig(user_data_dir=str(user_data_dir)))
+	assert browser_obj._prepare_user_data_dir(str(user_data_dir)) is True, (
+		'Expected a missing user_data_dir to be reported as created'
+	)
+	assert user_data_dir.is_dir()
+
+	# chrome's SingletonLock is a (dangling) symlink to '<hostname>-<pid>' of the chrome holding the profile
+	singleton_lock = user_data_dir / 'SingletonLock'
+	os.symlink(f'{socket.gethostname()}-{os.getpid()}', singleton_lock)
+	assert browser_obj._prepare_user_data_dir(str(user_data_dir)) is False, (
+		'Expected an existing user_data_dir not to be reported as created'
+	)
+	assert os.path.lexists(singleton_lock), 'Expected the SingletonLock of a running process to be kept'
+
+	exited = subprocess.Popen(['true'])
+	exited.wait()
+	os.remove(singleton_lock)
+	os.symlink(f'{socket.gethostname()}-{exited.pid}', singleton_lock)
+	browser_obj._prepare_user_data_dir(str(user_data_dir))
+	assert not os.path.lexists(singleton_lock), 'Expected the SingletonLock of an exited process to be removed'
+
+
+def test_screen_info_memoized_with_ttl(monkeypatch):
+	"""
+	Test that get_screen_resolution is only queried again once SCREEN_INFO_TTL has passed or reset_cache() is called.
+	"""
+	from browser_use.browser.utils import screen_resolution
+
+	calls = []
+	now = [1000.0]
+
+	def fake_get_monitors():
+		calls.append(now[0])
+
+		class DummyMonitor:
+			width, height = 1280, 720
+
+		return [DummyMonitor()]
+
+	monkeypatch.setattr(screen_resolution.sys, 'platform', 'linux')
+	monkeypatch.setattr(screen_resolution.time, 'monotonic', lambda: now[0])
+	monkeypatch.setattr('screeninfo.get_monitors', fake_get_monitors)
+	screen_resolution.reset_cache()
+	try:
+		assert screen_resolution.get_screen_resolution() == {'width': 1280, 'height': 720}
+		now[0] += screen_resolution.SCREEN_INFO_TTL - 1
+		screen_resolution.get_screen_resolution()
+		assert len(calls) == 1, 'Expected the screen resolution to be memoized within the TTL'
+
+		now[0] += 2
+		screen_resolution.get_screen_resolution()
+		assert len(calls) == 2, 'Expected the screen resolution to be queried again after the TTL'
+
+		screen_resolution.reset_cache()
+		screen_resolution.get_screen_resolution()
+		assert len(calls) == 3, 'Expected reset_cache() to drop the memoized value'
+	finally:
+		screen_resolution.reset_cache()
@@ -360,3 +360,105 @@ async def test_remove_highlights_failure():
 		await context.remove_highlights()
 	except Exception as e:
 		pytest.fail(f'remove_highlights raised an exception: {e}')
+
+
+@pytest.mark.asyncio
+async def test_static_resources_served_from_cache_dir(tmp_path):
+	"""
+	Test that BrowserContext._serve_static_resource fetches and stores a static resource on a miss,
+	and serves it with its original headers from the static_cache_dir without fetching on the next request.
+	Responses other than a 200 are not cached.
+	"""
+	fetches = []
+	status = 200
+
+	class DummyRequest:
+		method = 'GET'
+		url = 'https://en.wikipedia.org/static/images/logo.png?v=1'
+
+	class DummyResponse:
+		def __init__(self):
+			self.status = status
+			self.headers = {
+				'content-type': 'image/png',
+				'access-control-allow-origin': '*',
+				'content-encoding': 'gzip',
+			}
+
+		async def body(self):
+			return b'dummy-png'
+
+	class DummyRoute:
+		request = DummyRequest()
+
+		def __init__(self):
+			self.fulfilled = None
+
+		async def fetch(self):
+			fetches.append(self.request.url)
+			return DummyResponse()
+
+		async def fulfill(self, **kwargs):
+			self.fulfilled = kwargs
+
+	dummy_browser = Mock()
+	dummy_browser.config = Mock()
+	context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig(static_cache_dir=str(tmp_path)))
+
+	status = 206
+	partial = DummyRoute()
+	await context._serve_static_resource(partial)
+	assert isinstance(partial.fulfilled['response'], DummyResponse), 'Expected a partial response to be served as is'
+	assert list(tmp_path.iterdir()) == [], 'Expected a partial response not to be cached'
+
+	status = 200
+	miss = DummyRoute()
+	await context._serve_static_resource(miss)
+	assert isinstance(miss.fulfilled['response'], DummyResponse), 'Expected a miss to be served from the network'
+	cached_files = [path for path in tmp_path.iterdir() if path.suffix == '.png']
+	assert len(cached_files) == 1 and cached_files[0].read_bytes() == b'dummy-png'
+
+	hit = DummyRoute()
+	await context._serve_static_resource(hit)
+	assert hit.fulfilled == {
+		'status': 200,
+		'headers': {'content-type': 'image/png', 'access-control-allow-origin': '*'},
+		'body': b'dummy-png',
+	}, 'Expected a hit to be served from the cache dir with the original headers'
+	assert len(fetches) == 2, 'Expected the cached resource not to be fetched again'
+
+
+@pytest.mark.asyncio
+async def test_static_cache_routes_versioned_urls(tmp_path):
+	"""
+	Test that a context created with a static_cache_dir routes static resources to _serve_static_resource
+	by their path, so versioned urls are served from the cache too, and leaves other requests alone.
+	"""
+	routes = []
+
+	class DummyPlaywrightContext:
+		async def route(self, url, handler):
+			routes.append((url, handler))
+
+		async def add_init_script(self, script):
+			pass
+
+	class DummyPlaywrightBrowser:
+		contexts = []
+
+		async def new_context(self, **kwargs):
+			return DummyPlaywrightContext()
+
+	dummy_browser = Mock()
+	dummy_browser.config.cdp_url = None
+	dummy_browser.config.browser_binary_path = None
+	context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig(static_cache_dir=str(tmp_path)))
+	await context._create_context(DummyPlaywrightBrowser())
+
+	assert len(routes) == 1, 'Expected the static resources to be routed'
+	matcher, handler = routes[0]
+	assert handler == context._serve_static_resource
+	assert matcher('https://en.wikipedia.org/static/images/logo.png?v=1'), 'Expected versioned urls to be routed'
+	assert matcher('https://example.com/assets/Font.WOFF2')
+	assert not matcher('https://example.com/index.html?file=style.css'), 'Expected the query not to be matched'
+	assert not matcher('https://example.com/'), 'Expected documents not to be routed'